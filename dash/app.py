@@ -1,9 +1,13 @@
 import tkinter as tk
-from webloader import load as load_page
-from renderer import Renderer
+from queue import Empty
+from webloader import PageLoad
+from renderer import Renderer, CanvasBackend
 
 DEFAULT_WIN_TITLE = "<no title>"
+LOADING_WIN_TITLE = "Loading..."
 DEFAULT_BG_COLOR = "#ffffff"
+# Milliseconds between two checks whether a page has loaded
+POLL_DELAY = 20
 renderer = Renderer()
 
 class App:
@@ -17,21 +21,72 @@ class App:
         height = self.win.winfo_screenheight() // 4 * 3
         self.win.geometry(f"{width}x{height}")
         self.win["background"] = DEFAULT_BG_COLOR
-        self.win.bind("<Escape>", lambda e: exit())
+        self.win.bind("<Escape>", self.escape)
         self.win.bind("<F11>", self.toggle_fullscreen)
+        self.backend = CanvasBackend(self.win)
         self.document = None
+        self.loading: PageLoad = None
 
     def toggle_fullscreen(self, event: tk.Event):
         self.fullscreen = not self.fullscreen
         self.win.attributes("-fullscreen", self.fullscreen)
 
+    def escape(self, event: tk.Event) -> None:
+        """
+        Cancels the page being loaded, or exits if there is none.
+        """
+        if self.loading:
+            self.cancel_load()
+        else:
+            exit()
+
     def load_page(self, url: str) -> None:
-        self.document = load_page(url)
+        """
+        Starts loading the page in the background and renders it
+        once it is loaded, without blocking the event loop.
+        """
+        self.cancel_load()
+        self.loading = PageLoad(url)
+        self.loading.start()
+        self.win.title(LOADING_WIN_TITLE)
+        self.win.after(POLL_DELAY, self.poll_load, self.loading)
+
+    def cancel_load(self) -> None:
+        """
+        Cancels the page being loaded, if any.
+        """
+        if not self.loading:
+            return
+        self.loading.cancel()
+        self.loading = None
+        if self.document:
+            self.win.title(self.document.title or DEFAULT_WIN_TITLE)
+        else:
+            self.win.title(DEFAULT_WIN_TITLE)
+
+    def poll_load(self, load: PageLoad) -> None:
+        """
+        Renders the loaded page, or checks again later if
+        the page is still loading. Errors of the load are
+        raised here on the GUI thread.
+        """
+        if load is not self.loading:
+            return
+        try:
+            document, error = load.results.get_nowait()
+        except Empty:
+            self.win.after(POLL_DELAY, self.poll_load, load)
+            return
+        self.loading = None
+        if error:
+            self.win.title(DEFAULT_WIN_TITLE)
+            raise error
+        self.document = document
+        self.render()
 
     def render(self) -> None:
         components = renderer.render(self.document)
-        for component in components:
-            component.draw(self.win)
+        self.backend.paint(components)
         self.win.title(self.document.title or DEFAULT_WIN_TITLE)
 
     def run(self) -> None:
@@ -1,3 +1,3 @@
 from dom.window import Window
 from dom.document import Document
-from dom.node import Node, Root, Text
+from dom.node import Node, Root, Text, TreeWalker
@@ -1,4 +1,10 @@
-from dom.node import Node
+from dom.node import Node, TreeWalker
+
+def text_filter(node: Node) -> int:
+    """
+    Accepts only text nodes.
+    """
+    return TreeWalker.ACCEPT if node.is_text() else TreeWalker.SKIP
 
 class Doctype:
     """
@@ -17,8 +23,5 @@ class Document:
         self.doctype = Doctype("")
         self.root = root
         self.html = root
-        title = ""
-        for child in root.head.title.walk():
-            if child.is_text():
-                title += child.data
-        self.title = title
+        walker = TreeWalker(root.head.title, text_filter)
+        self.title = "".join(child.data for child in walker)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Union
+from types import MappingProxyType
+from typing import Callable, Iterator, Union
 
 def indent(string: str, spaces: int=2):
     """
@@ -24,6 +25,7 @@ class Node:
         self.parent = parent
         self.children = children or []
         self.nullish = False
+        self.child_index: dict[str, Node] = None
 
     def __repr__(self) -> str:
         children = ""
@@ -38,16 +40,19 @@ class Node:
         return not self.nullish
 
     def __getattr__(self, name: str):
-        for child in self.children:
-            if child.name == name.lower():
-                return child
-        return self.null()
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if self.child_index is None:
+            self.child_index = {}
+            for child in self.children:
+                self.child_index.setdefault(child.name, child)
+        return self.child_index.get(name.lower(), NULL_NODE)
 
     def is_text(self) -> Union[Text, Node]:
         """
         Returns `self` if `self.type` is `"CHAR"`.
         """
-        return self if self.name == "<text>" else Node.null()
+        return self if self.name == "<text>" else NULL_NODE
 
     def adopt(self, child: Node) -> Node:
         """
@@ -55,26 +60,44 @@ class Node:
         """
         self.children.append(child)
         child.parent = self
+        self.child_index = None
 
-    def walk(self):
+    def walk(self) -> Iterator[Node]:
         """
         Walks through every descendant node of this node.
         """
-        for child in self.children:
-            yield child
-            if child.children:
-                yield from child.walk()
+        return iter(TreeWalker(self))
 
     @classmethod
     def null(cls) -> Node:
         """
-        Creates a null node.
+        Returns the shared null node.
         """
-        node = cls("")
-        node.nullish = True
-        node.name = "<null>"
-        node.data = "<null>"
-        return node
+        return NULL_NODE
+
+class NullNode(Node):
+    """
+    Represents the absence of a node. Use the shared
+    `NULL_NODE` instead of creating new instances.
+    """
+    def __init__(self) -> None:
+        self.__dict__.update(
+            name="<null>",
+            data="<null>",
+            attrs=MappingProxyType({}),
+            parent=None,
+            children=(),
+            nullish=True,
+            child_index={}
+        )
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("The null node is immutable")
+
+    def adopt(self, child: Node) -> Node:
+        raise AttributeError("The null node is immutable")
+
+NULL_NODE = NullNode()
 
 class Root(Node):
     """
@@ -99,3 +122,36 @@ class Text(Node):
     def __init__(self, data: str="") -> None:
         super().__init__("<text>")
         self.data = data
+
+class TreeWalker:
+    """
+    Walks through the descendants of a node in document order
+    using an explicit stack instead of recursion.
+
+    For every node, `filter` decides whether the node is yielded
+    (`ACCEPT`), skipped while its children are still walked (`SKIP`)
+    or skipped together with its whole subtree (`REJECT`).
+    """
+    ACCEPT = 0
+    SKIP = 1
+    REJECT = 2
+
+    def __init__(self,
+        root: Node,
+        filter: Callable[[Node], int]=None
+    ) -> None:
+        self.root = root
+        self.filter = filter
+
+    def __iter__(self) -> Iterator[Node]:
+        node_filter = self.filter
+        stack = self.root.children[::-1]
+        while stack:
+            node = stack.pop()
+            result = node_filter(node) if node_filter else self.ACCEPT
+            if result == self.REJECT:
+                continue
+            if result == self.ACCEPT:
+                yield node
+            if node.children:
+                stack.extend(reversed(node.children))
@@ -7,18 +7,38 @@ from dom.document import Document
 class Parser:
     """
     Represents a single parsable HTML text.
+
+    The text can either be passed as a whole and parsed with
+    `self.parse`, or pushed in chunks with `self.feed` and
+    finished with `self.close`.
     """
-    def __init__(self, html: str) -> None:
+    def __init__(self, html: str="") -> None:
         self.html = html
+        self.tokenizer = Tokenizer(coalesce=True)
+        self.tokenizer.reset()
+        self.tree_constructor = TreeConstructor()
+        self.tree_constructor.reset()
+
+    def feed(self, html: str) -> None:
+        """
+        Parses the next chunk of HTML as far as possible.
+        """
+        for token in self.tokenizer.feed(html):
+            self.tree_constructor.handle(token)
+
+    def close(self) -> Document:
+        """
+        Parses the rest of the fed HTML into a document object.
+        """
+        for token in self.tokenizer.close():
+            self.tree_constructor.handle(token)
+        self.tree_constructor.flush_text()
+        root = self.tree_constructor.root.unpack()
+        return Document(root)
 
     def parse(self) -> Document:
         """
         Parses the HTML into a document object.
         """
-        tokenizer = Tokenizer(self.html)
-        tree_constructor = TreeConstructor()
-        tree_constructor.reset()
-        for token in tokenizer.tokenize():
-            tree_constructor.handle(token)
-        root = tree_constructor.root.unpack()
-        return Document(root)
+        self.feed(self.html)
+        return self.close()
@@ -1,15 +1,41 @@
 from typing import Iterator
+from re import Pattern, compile as regex
 from html_parser.constants import *
 from html_parser.tokens import *
+from html_parser.trie import Trie
 
 # https://html.spec.whatwg.org/multipage/parsing.html#tokenization
 
+# Shared by all tokenizers, so it is only built once
+CHAR_REF_TRIE = Trie(CHAR_REFS)
+
+# Characters which end a run of characters in the respective states
+data_delimiters_regex = regex(r"[&<\0]")
+rawtext_delimiters_regex = regex(r"[<\0]")
+dquoted_delimiters_regex = regex(r"[\"&\0]")
+squoted_delimiters_regex = regex(r"['&\0]")
+comment_delimiters_regex = regex(r"[<\-\0]")
+
+class InputPending(Exception):
+    """
+    Raised when the tokenizer needs to look further
+    than the input which has been fed so far.
+    """
+
 class Tokenizer:
     """
     Represents a single tokenizable HTML text.
+
+    If `coalesce` is set, consecutive character tokens are merged
+    into a single character token holding the whole run of text.
     """
-    def __init__(self, html: str) -> None:
+    def __init__(self, html: str="", coalesce: bool=False) -> None:
         self.html = html
+        self.coalesce = coalesce
+        self.states = {
+            name[:-len("_state")].upper(): getattr(self, name)
+            for name in dir(type(self)) if name.endswith("_state")
+        }
 
     def reset(self) -> None:
         """
@@ -17,27 +43,50 @@ class Tokenizer:
         """
         self.state = "DATA"
         self.temp: Token = None
-        self.pos = -1
-        self.last_start_tag: Token = Token.null()
-        self.next()
+        self.pos = 0
+        self.closed = False
+        self.last_start_tag: Token = NULL_TOKEN
+        self.read()
 
-    def next(self) -> str:
+    def read(self) -> str:
         """
-        Advances the position by 1 character.
+        Reads the character at the current position.
         """
-        self.pos += 1
         try:
             self.char = self.html[self.pos]
         except IndexError:
             self.char = EOF
         return self.char
 
+    def next(self) -> str:
+        """
+        Advances the position by 1 character.
+        """
+        self.pos += 1
+        if self.pos >= len(self.html) and not self.closed:
+            raise InputPending
+        return self.read()
+
     def lookahead(self, count: int=1) -> str:
         """
         Looks ahead for the next `count` characters.
         """
+        if self.pos + count > len(self.html) and not self.closed:
+            raise InputPending
         return self.html[self.pos:self.pos + count]
 
+    def consume_run(self, delimiters: Pattern) -> str:
+        """
+        Consumes characters starting at the current one up to
+        (but not including) the next delimiter or EOF and returns them.
+        """
+        start = self.pos
+        match = delimiters.search(self.html, start + 1)
+        end = match.start() if match else len(self.html)
+        self.pos = end - 1
+        self.char = self.html[self.pos]
+        return self.html[start:end]
+
     def temp_clear(self) -> Token:
         """
         Clears the temporary token and returns it.
@@ -60,43 +109,81 @@ class Tokenizer:
         """
         if "ATTR_VALUE" in self.return_state:
             for char in self.temp_string:
-                self.temp.temp_attr[1] += self.char
+                self.temp.temp_attr[1] += char
         else:
             chars = []
             for char in self.temp_string:
                 chars.append(Character(char))
             return (*chars,)
 
-    def possible_char_ref(self) -> bool:
-        """
-        Returns a boolean indicating whether the current temp string
-        is a possible character reference.
-        """
-        for char_ref in CHAR_REFS:
-            if char_ref.startswith(self.temp_string):
-                return True
-        return False
-
     def tokenize(self) -> Iterator[Token]:
         """
         Tokenizes the HTML and returns a list of tokens.
         """
         self.reset()
+        self.closed = True
+        yield from self.run()
+
+    def feed(self, html: str) -> Iterator[Token]:
+        """
+        Appends a chunk of HTML to the input and returns
+        the tokens which can be emitted so far.
+        """
+        # Drop the input which has already been tokenized, except for
+        # a named character reference which is still being matched
+        start = self.pos
+        if self.state == "NAMED_CHAR_REF":
+            start = max(start - len(self.temp_string), 0)
+        self.html = self.html[start:] + html
+        self.pos -= start
+        self.read()
+        yield from self.run()
+
+    def close(self) -> Iterator[Token]:
+        """
+        Marks the end of the input and returns the remaining tokens.
+        """
+        self.closed = True
+        self.read()
+        yield from self.run()
+
+    def run(self) -> Iterator[Token]:
+        """
+        Runs the state machine until the input is exhausted.
+        """
+        states = self.states
+        run = []
         while self.pos <= len(self.html):
-            state_func = self.state.lower() + "_state"
-            tokens: Token = getattr(self, state_func)()
-            if isinstance(tokens, tuple):
-                for token in tokens:
-                    if isinstance(token, StartTag):
-                        self.last_start_tag = token
-                    yield token
-                    if token.new_state: self.state = token.new_state
-            elif tokens:
-                if isinstance(tokens, StartTag):
-                    self.last_start_tag = tokens
-                yield tokens
-                if tokens.new_state: self.state = tokens.new_state
-            self.next()
+            if self.pos == len(self.html) and not self.closed:
+                break
+            pos = self.pos
+            try:
+                tokens: Token = states[self.state]()
+            except InputPending:
+                self.pos = pos
+                self.read()
+                break
+            if not tokens:
+                self.pos += 1
+                self.read()
+                continue
+            if not isinstance(tokens, tuple):
+                tokens = (tokens,)
+            for token in tokens:
+                if self.coalesce and token.type == TokenType.CHAR:
+                    run.append(token.data)
+                    continue
+                if run:
+                    yield Character("".join(run))
+                    run = []
+                if token.type == TokenType.START_TAG:
+                    self.last_start_tag = token
+                yield token
+                if token.new_state: self.state = token.new_state
+            self.pos += 1
+            self.read()
+        if run:
+            yield Character("".join(run))
 
     def data_state(self):
         if self.char == "&":
@@ -109,6 +196,8 @@ class Tokenizer:
             return Character(self.char)
         elif self.char == EOF:
             return Eof()
+        elif self.coalesce:
+            return Character(self.consume_run(data_delimiters_regex))
         else:
             return Character(self.char)
 
@@ -123,6 +212,8 @@ class Tokenizer:
             return Character(REPLACEMENT_CHAR)
         elif self.char == EOF:
             return Eof()
+        elif self.coalesce:
+            return Character(self.consume_run(data_delimiters_regex))
         else:
             return Character(self.char)
 
@@ -134,6 +225,8 @@ class Tokenizer:
             return Character(REPLACEMENT_CHAR)
         elif self.char == EOF:
             return Eof()
+        elif self.coalesce:
+            return Character(self.consume_run(rawtext_delimiters_regex))
         else:
             return Character(self.char)
 
@@ -374,7 +467,8 @@ class Tokenizer:
             # Parse Error
             return Eof()
         else:
-            self.temp.temp_attr[1] += self.char
+            self.temp.temp_attr[1] += \
+            self.consume_run(dquoted_delimiters_regex)
 
     def attr_value_squoted_state(self):
         if self.char == "'":
@@ -389,7 +483,8 @@ class Tokenizer:
             # Parse Error
             return Eof()
         else:
-            self.temp.temp_attr[1] += self.char
+            self.temp.temp_attr[1] += \
+            self.consume_run(squoted_delimiters_regex)
 
     def attr_value_unquoted_state(self):
         if self.char in SPACE:
@@ -486,7 +581,7 @@ class Tokenizer:
             # Parse Error
             return (self.temp, Eof())
         else:
-            self.temp.data += self.char
+            self.temp.data += self.consume_run(comment_delimiters_regex)
 
     def comment_lessthan_state(self):
         if self.char == "!":
@@ -662,6 +757,8 @@ class Tokenizer:
     def char_ref_state(self):
         self.temp_string = "&"
         if self.char in ASCII_ALPHANUM:
+            self.char_ref_node = CHAR_REF_TRIE.node("&")
+            self.char_ref_match = None
             self.state = "NAMED_CHAR_REF"
             self.pos -= 1
         elif self.char == "#":
@@ -674,26 +771,33 @@ class Tokenizer:
             if tokens: return tokens
 
     def named_char_ref_state(self):
-        self.temp_string += self.char
-        if self.char in ASCII_ALPHANUM + ";" and self.possible_char_ref():
-            if self.temp_string in CHAR_REFS:
-                if "ATTR_VALUE" in self.state and \
-                self.char != ";" and self.lookahead(2)[1] in \
-                ASCII_ALPHANUM + "=":
-                    tokens = self.flush_code_points()
-                    self.state = self.return_state
-                    if tokens: return tokens
-                else:
-                    if self.char != ";":
-                        # Parse Error
-                        pass
-                    char_ref = CHAR_REFS[self.temp_string]
-                    self.temp_string = ""
-                    for char in char_ref:
-                        self.temp_string += char
-                    tokens = self.flush_code_points()
-                    self.state = self.return_state
-                    if tokens: return tokens
+        node = self.char_ref_node.get(self.char)
+        if node is not None:
+            self.temp_string += self.char
+            self.char_ref_node = node
+            if "" in node:
+                self.char_ref_match = (len(self.temp_string), node[""])
+        elif self.char_ref_match:
+            length, char_ref = self.char_ref_match
+            # Unconsume the characters after the longest match
+            extra = len(self.temp_string) - length
+            self.temp_string = self.temp_string[:length]
+            self.pos -= extra + 1
+            next_char = self.lookahead(2)[1:]
+            if "ATTR_VALUE" in self.return_state and \
+            self.temp_string[-1] != ";" and next_char and \
+            next_char in ASCII_ALPHANUM + "=":
+                tokens = self.flush_code_points()
+                self.state = self.return_state
+                if tokens: return tokens
+            else:
+                if self.temp_string[-1] != ";":
+                    # Parse Error
+                    pass
+                self.temp_string = char_ref
+                tokens = self.flush_code_points()
+                self.state = self.return_state
+                if tokens: return tokens
         else:
             tokens = self.flush_code_points()
             self.state = "AMBIGUOUS_AMP"
@@ -702,9 +806,12 @@ class Tokenizer:
 
     def ambiguous_amp_state(self):
         if self.char in ASCII_ALPHANUM:
-            self.temp_string += self.char
-            tokens = self.flush_code_points()
-            if tokens: return tokens
+            # Only the current character is emitted, as the temporary
+            # string has already been flushed by the named reference
+            if "ATTR_VALUE" in self.return_state:
+                self.temp.temp_attr[1] += self.char
+            else:
+                return Character(self.char)
         elif self.char == ";":
             # Parse Error
             self.state = self.return_state
@@ -1,98 +1,129 @@
 from __future__ import annotations
 from typing import Union
 
+class TokenType:
+    """
+    Enumerates the token types.
+    """
+    NULL = 0
+    DOCTYPE = 1
+    START_TAG = 2
+    END_TAG = 3
+    COMMENT = 4
+    CHAR = 5
+    EOF = 6
+
+TYPE_NAMES = ("", "DOCTYPE", "START_TAG", "END_TAG", "COMMENT", "CHAR", "EOF")
+
 class Token:
     """
     Represents a base HTML token.
     """
-    def __init__(self, type_: str) -> None:
+    __slots__ = ("type", "new_state")
+
+    def __init__(self, type_: int) -> None:
         self.type = type_
         self.new_state = None
-        self.nullish = False
 
     def __repr__(self) -> str:
-        return f"<{self.type}>"
+        return f"<{TYPE_NAMES[self.type]}>"
 
     def __bool__(self) -> bool:
-        return not self.nullish
+        return self.type != TokenType.NULL
 
     def is_doctype(self) -> Union[Doctype, Token]:
         """
-        Returns `self` if `self.type` is `"DOCTYPE"`.
+        Returns `self` if `self.type` is `TokenType.DOCTYPE`.
         """
-        return self if self.type == "DOCTYPE" else Token.null()
+        return self if self.type == TokenType.DOCTYPE else NULL_TOKEN
 
     def is_start_tag(self) -> Union[StartTag, Token]:
         """
-        Returns `self` if `self.type` is `"START_TAG"`.
+        Returns `self` if `self.type` is `TokenType.START_TAG`.
         """
-        return self if self.type == "START_TAG" else Token.null()
+        return self if self.type == TokenType.START_TAG else NULL_TOKEN
 
     def is_end_tag(self) -> Union[EndTag, Token]:
         """
-        Returns `self` if `self.type` is `"END_TAG"`.
+        Returns `self` if `self.type` is `TokenType.END_TAG`.
         """
-        return self if self.type == "END_TAG" else Token.null()
+        return self if self.type == TokenType.END_TAG else NULL_TOKEN
 
     def is_comment(self) -> Union[Comment, Token]:
         """
-        Returns `self` if `self.type` is `"COMMENT"`.
+        Returns `self` if `self.type` is `TokenType.COMMENT`.
         """
-        return self if self.type == "COMMENT" else Token.null()
+        return self if self.type == TokenType.COMMENT else NULL_TOKEN
 
     def is_char(self) -> Union[Character, Token]:
         """
-        Returns `self` if `self.type` is `"CHAR"`.
+        Returns `self` if `self.type` is `TokenType.CHAR`.
         """
-        return self if self.type == "CHAR" else Token.null()
+        return self if self.type == TokenType.CHAR else NULL_TOKEN
 
     def is_eof(self) -> Union[Eof, Token]:
         """
-        Returns `self` if `self.type` is `"CHAR"`.
+        Returns `self` if `self.type` is `TokenType.EOF`.
         """
-        return self if self.type == "EOF" else Token.null()
+        return self if self.type == TokenType.EOF else NULL_TOKEN
 
     @classmethod
     def null(cls) -> Token:
         """
-        Creates a null token.
+        Returns the shared null token.
         """
-        token = cls("")
-        token.nullish = True
-        token.name = "<null>"
-        token.data = "<null>"
-        return token
+        return NULL_TOKEN
+
+class NullToken(Token):
+    """
+    Represents the absence of a token. Use the shared
+    `NULL_TOKEN` instead of creating new instances.
+    """
+    __slots__ = ()
+    name = "<null>"
+    data = "<null>"
+
+    def __init__(self) -> None:
+        super().__init__(TokenType.NULL)
+
+NULL_TOKEN = NullToken()
 
 class Doctype(Token):
     """
     Represents a DOCTYPE token.
     """
+    __slots__ = ("name", "pub_id", "sys_id", "force_quirks")
+
     def __init__(self,
         name: str="",
         pub_id: str=None,
         sys_id: str=None,
         force_quirks: bool=False
     ) -> None:
-        super().__init__("DOCTYPE")
+        super().__init__(TokenType.DOCTYPE)
         self.name = name
         self.pub_id = pub_id
         self.sys_id = sys_id
         self.force_quirks = force_quirks
 
     def __repr__(self) -> str:
-        return f"<{self.type}>|{self.name}|{self.pub_id}|\
+        return f"<{TYPE_NAMES[self.type]}>|{self.name}|{self.pub_id}|\
 {self.sys_id}|{self.force_quirks}|"
 
 class StartTag(Token):
     """
     Represents a start tag token.
     """
+    __slots__ = (
+        "name", "self_closing", "attrs", "temp_attr", "temp_attr_invalid"
+    )
+
     def __init__(self,
         name: str="",
         self_closing: bool=False,
         attrs: dict[str, str]=None
     ) -> None:
-        super().__init__("START_TAG")
+        super().__init__(TokenType.START_TAG)
         self.name = name
         self.self_closing = self_closing
         self.attrs = attrs or {}
@@ -100,7 +131,7 @@ class StartTag(Token):
         self.temp_attr_invalid = False
 
     def __repr__(self) -> str:
-        return f"<{self.type}>|{self.name}|\
+        return f"<{TYPE_NAMES[self.type]}>|{self.name}|\
 {self.self_closing}|{self.attrs}|"
 
     def new_attr(self, name: str, value: str) -> None:
@@ -125,38 +156,46 @@ class EndTag(Token):
     """
     Represents an end tag token.
     """
+    __slots__ = ("name",)
+
     def __init__(self, name: str="") -> None:
-        super().__init__("END_TAG")
+        super().__init__(TokenType.END_TAG)
         self.name = name
 
     def __repr__(self) -> str:
-        return f"<{self.type}>|{self.name}|"
+        return f"<{TYPE_NAMES[self.type]}>|{self.name}|"
 
 class Comment(Token):
     """
     Represents a comment token.
     """
+    __slots__ = ("data",)
+
     def __init__(self, data: str="") -> None:
-        super().__init__("COMMENT")
+        super().__init__(TokenType.COMMENT)
         self.data = data
 
     def __repr__(self) -> str:
-        return f"<{self.type}>|{self.data}|"
+        return f"<{TYPE_NAMES[self.type]}>|{self.data}|"
 
 class Character(Token):
     """
     Represents a character token.
     """
+    __slots__ = ("data",)
+
     def __init__(self, data: str="") -> None:
-        super().__init__("CHAR")
+        super().__init__(TokenType.CHAR)
         self.data = data
 
     def __repr__(self) -> str:
-        return f"<{self.type}>|{self.data}|"
+        return f"<{TYPE_NAMES[self.type]}>|{self.data}|"
 
 class Eof(Token):
     """
     Represents an end-of-file token.
     """
+    __slots__ = ()
+
     def __init__(self) -> None:
-        super().__init__("EOF")
+        super().__init__(TokenType.EOF)
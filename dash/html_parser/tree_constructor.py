@@ -1,14 +1,123 @@
 from html_parser.constants import *
-from html_parser.tokens import Token
+from html_parser.tokens import Token, TokenType, Character
 from dom.node import Node, Root, Text
 
 # https://html.spec.whatwg.org/multipage/parsing.html#tree-construction
 
+# Insertion modes which handle whitespace characters differently
+# from other characters
+SPACE_MODES = (
+    "INITIAL", "BEFORE_HTML", "BEFORE_HEAD", "IN_HEAD", "AFTER_HEAD"
+)
+TAG_TYPES = (TokenType.START_TAG, TokenType.END_TAG)
+
+def start_tags(*names: str) -> list[tuple[int, str]]:
+    """
+    Returns the dispatch keys of start tags with the given names.
+    """
+    return [(TokenType.START_TAG, name) for name in names]
+
+def end_tags(*names: str) -> list[tuple[int, str]]:
+    """
+    Returns the dispatch keys of end tags with the given names.
+    """
+    return [(TokenType.END_TAG, name) for name in names]
+
 class TreeConstructor:
     """
     Represents a single stream of tokens from which
     a Node tree can be constructed.
     """
+    def __init__(self) -> None:
+        # Every insertion mode maps either a token type or a pair of
+        # a tag token type and a tag name to a handler. The handler
+        # under `None` handles any other token.
+        self.modes = {
+            "INITIAL": {
+                TokenType.CHAR: self.initial_char,
+                TokenType.COMMENT: self.ignore,
+                TokenType.DOCTYPE: self.initial_doctype,
+                None: self.initial_anything_else,
+            },
+            "BEFORE_HTML": {
+                TokenType.DOCTYPE: self.ignore, # Parse Error
+                TokenType.COMMENT: self.ignore,
+                TokenType.CHAR: self.before_html_char,
+                (TokenType.START_TAG, "html"): self.before_html_start_html,
+                **dict.fromkeys(end_tags("head", "body", "html", "br"),
+                self.before_html_anything_else),
+                TokenType.END_TAG: self.ignore, # Parse Error
+                None: self.before_html_anything_else,
+            },
+            "BEFORE_HEAD": {
+                TokenType.CHAR: self.before_head_char,
+                TokenType.COMMENT: self.ignore,
+                TokenType.DOCTYPE: self.ignore, # Parse Error
+                (TokenType.START_TAG, "html"): self.in_body_rules,
+                (TokenType.START_TAG, "head"): self.before_head_start_head,
+                **dict.fromkeys(end_tags("head", "body", "html", "br"),
+                self.before_head_anything_else),
+                TokenType.END_TAG: self.ignore, # Parse Error
+                None: self.before_head_anything_else,
+            },
+            "IN_HEAD": {
+                TokenType.CHAR: self.in_head_char,
+                TokenType.COMMENT: self.ignore,
+                TokenType.DOCTYPE: self.ignore, # Parse Error
+                (TokenType.START_TAG, "html"): self.in_body_rules,
+                **dict.fromkeys(start_tags("base", "basefont", "bgsound",
+                "link", "meta"), self.in_head_start_void),
+                (TokenType.START_TAG, "title"): self.in_head_start_title,
+                **dict.fromkeys(start_tags("noframes", "style"),
+                self.in_head_start_raw_text),
+                (TokenType.END_TAG, "head"): self.in_head_end_head,
+                None: self.in_head_anything_else,
+            },
+            "AFTER_HEAD": {
+                TokenType.CHAR: self.after_head_char,
+                TokenType.COMMENT: self.ignore,
+                TokenType.DOCTYPE: self.ignore, # Parse Error
+                (TokenType.START_TAG, "html"): self.in_body_rules,
+                (TokenType.START_TAG, "body"): self.after_head_start_body,
+                (TokenType.START_TAG, "frameset"):
+                self.after_head_start_frameset,
+                **dict.fromkeys(start_tags("base", "basefont", "bgsound",
+                "link", "meta", "noframes", "script", "style", "template",
+                "title"), self.after_head_start_head_content),
+                (TokenType.END_TAG, "template"): self.in_head_rules,
+                (TokenType.START_TAG, "head"): self.ignore, # Parse Error
+                **dict.fromkeys(end_tags("body", "html", "br"),
+                self.after_head_anything_else),
+                TokenType.END_TAG: self.ignore, # Parse Error
+                None: self.after_head_anything_else,
+            },
+            "IN_BODY": {
+                TokenType.CHAR: self.in_body_char,
+                TokenType.COMMENT: self.ignore,
+                TokenType.DOCTYPE: self.ignore, # Parse Error
+                (TokenType.START_TAG, "html"): self.in_body_start_html,
+                **dict.fromkeys(start_tags("base", "basefont", "bgsound",
+                "link", "meta", "noframes", "script", "style", "template",
+                "title"), self.in_head_rules),
+                (TokenType.END_TAG, "template"): self.in_head_rules,
+                **dict.fromkeys(start_tags("address", "article", "aside",
+                "blockquote", "center", "details", "dialog", "dir", "div",
+                "dl", "fieldset", "figcaption", "figure", "footer",
+                "header", "main", "nav", "ol", "p", "section", "summary",
+                "ul"), self.in_body_start_block),
+                **dict.fromkeys(start_tags("h1", "h2", "h3", "h4", "h5",
+                "h6"), self.in_body_start_block),
+                **dict.fromkeys(end_tags("p", "h1", "h2", "h3", "h4", "h5",
+                "h6"), self.in_body_end_block),
+                None: self.ignore,
+            },
+            "TEXT": {
+                TokenType.CHAR: self.text_char,
+                TokenType.EOF: self.text_eof,
+                None: self.text_anything_else,
+            },
+        }
+
     def reset(self) -> None:
         """
         Resets the tree constructor state.
@@ -21,6 +130,8 @@ class TreeConstructor:
         self.open_nodes: list[Node] = []
         self.head = None
         self.root = Root()
+        self.pending_node: Text = None
+        self.pending_text: list[str] = []
 
     def insert_node(self, node: Node) -> None:
         """
@@ -33,13 +144,39 @@ class TreeConstructor:
     def insert_char(self, char: str) -> None:
         """
         Inserts the character into the last open node.
+        The text is only added to the node by `self.flush_text`.
         """
         parent = self.open_nodes[-1]
-        if parent.children and (text := parent.children[-1].is_text()):
-            text.data += char
+        last = parent.children[-1] if parent.children else None
+        if last is not None and last is self.pending_node:
+            self.pending_text.append(char)
+            return
+        self.flush_text()
+        if last is not None and (text := last.is_text()):
+            self.pending_node = text
+            self.pending_text = [text.data, char]
         else:
-            node = Text(char)
+            node = Text()
             parent.adopt(node)
+            self.pending_node = node
+            self.pending_text = [char]
+
+    def flush_text(self) -> None:
+        """
+        Joins the pending text into its text node.
+        """
+        if self.pending_node is not None:
+            self.pending_node.data = "".join(self.pending_text)
+            self.pending_node = None
+            self.pending_text = []
+
+    def is_space(self) -> bool:
+        """
+        Returns a boolean indicating whether the current token
+        is a character token consisting only of whitespace.
+        """
+        return self.token.type == TokenType.CHAR and \
+        not self.token.data.strip(SPACE_CR)
 
     def parse_raw_text(self, algorithm: str) -> None:
         """
@@ -55,247 +192,221 @@ class TreeConstructor:
         """
         Handles an incoming token from a token stream.
         """
+        if token.type == TokenType.CHAR and self.mode in SPACE_MODES:
+            # Character runs may start with whitespace which these
+            # modes handle separately from the rest of the run
+            text = token.data.lstrip(SPACE_CR)
+            if text and text != token.data:
+                self.handle(Character(token.data[:-len(text)]))
+                token = Character(text)
+        if token.type != TokenType.CHAR:
+            self.flush_text()
         self.token = token
         while self.reprocess:
             self.reprocess = False
-            mode_func = self.mode.lower() + "_mode"
-            getattr(self, mode_func)()
+            self.process(self.mode)
         self.reprocess = True
 
-    def initial_mode(self):
-        if self.token.is_char().data in SPACE_CR:
-            pass
-        elif self.token.is_comment():
-            pass
-        elif doctype := self.token.is_doctype():
-            if doctype.name != "html" or doctype.pub_id or \
-            (doctype.sys_id and doctype.sys_id != "about:legacy-compat"):
-                # Parse Error
-                pass
-            self.mode = "BEFORE_HTML"
-            if doctype.force_quirks:
-                self.quirks_mode = True
-                return
-            if doctype.name != "html":
-                self.quirks_mode = True
-                return
-            if doctype.pub_id is not None:
-                for string in PUB_ID_EQUALS:
-                    if string.lower() == doctype.pub_id.lower():
-                        self.quirks_mode = True
-                        return
-                for string in PUB_ID_STARTS:
-                    if doctype.pub_id.lower().startswith(string.lower()):
-                        self.quirks_mode = True
-                        return
-            if doctype.sys_id is not None:
-                for string in SYS_ID_EQUALS:
-                    if string.lower() == doctype.sys_id.lower():
-                        self.quirks_mode = True
-                        return
-            if doctype.pub_id is not None and doctype.sys_id is None:
-                for string in PUB_ID_STARTS_NO_SYS_ID:
-                    if doctype.pub_id.lower().startswith(string.lower()):
-                        self.quirks_mode = True
-                        return
-            if doctype.pub_id is not None and doctype.sys_id is not None:
-                for string in PUB_ID_STARTS_HAS_SYS_ID:
-                    if doctype.pub_id.lower().startswith(string.lower()):
-                        self.quirks_mode = True
-                        return
-        else:
-            # Parse Error
-            self.quirks_mode = True
-            self.mode = "BEFORE_HTML"
-            self.reprocess = True
+    def process(self, mode: str) -> None:
+        """
+        Processes the current token according to
+        the rules for the insertion `mode`.
+        """
+        handlers = self.modes[mode]
+        token = self.token
+        handler = None
+        if token.type in TAG_TYPES:
+            handler = handlers.get((token.type, token.name))
+        handler = handler or handlers.get(token.type) or handlers[None]
+        handler()
 
-    def before_html_mode(self):
-        if self.token.is_doctype():
-            # Parse Error
-            pass
-        elif self.token.is_comment():
-            pass
-        elif self.token.is_char().data in SPACE_CR:
-            pass
-        elif self.token.is_start_tag().name == "html":
-            node = Node("html", self.token.attrs)
-            self.root.adopt(node)
-            self.open_nodes.append(node)
-            self.mode = "BEFORE_HEAD"
-        elif self.token.is_end_tag().name not in \
-        ("<null>", "head", "body", "html", "br"):
-            # Parse Error
-            pass
-        else:
-            node = Node("html")
-            self.root.adopt(node)
-            self.open_nodes.append(node)
-            self.mode = "BEFORE_HEAD"
-            self.reprocess = True
-
-    def before_head_mode(self):
-        if self.token.is_char().data in SPACE_CR:
-            pass
-        elif self.token.is_comment():
-            pass
-        elif self.token.is_doctype():
-            # Parse Error
-            pass
-        elif self.token.is_start_tag().name == "html":
-            # Parse Error
-            self.in_body_mode()
-        elif self.token.is_start_tag().name == "head":
-            node = Node("head", self.token.attrs)
-            self.insert_node(node)
-            self.head = node
-            self.mode = "IN_HEAD"
-        elif self.token.is_end_tag().name not in \
-        ("<null>", "head", "body", "html", "br"):
+    def ignore(self):
+        pass
+
+    def in_head_rules(self):
+        self.process("IN_HEAD")
+
+    def in_body_rules(self):
+        self.process("IN_BODY")
+
+    def initial_char(self):
+        if not self.is_space():
+            self.initial_anything_else()
+
+    def initial_doctype(self):
+        doctype = self.token
+        if doctype.name != "html" or doctype.pub_id or \
+        (doctype.sys_id and doctype.sys_id != "about:legacy-compat"):
             # Parse Error
             pass
-        else:
-            node = Node("head")
-            self.insert_node(node)
-            self.head = node
-            self.mode = "IN_HEAD"
-            self.reprocess = True
-
-    def in_head_mode(self):
-        if self.token.is_char().data in SPACE_CR:
+        self.mode = "BEFORE_HTML"
+        if doctype.force_quirks:
+            self.quirks_mode = True
+            return
+        if doctype.name != "html":
+            self.quirks_mode = True
+            return
+        if doctype.pub_id is not None:
+            for string in PUB_ID_EQUALS:
+                if string.lower() == doctype.pub_id.lower():
+                    self.quirks_mode = True
+                    return
+            for string in PUB_ID_STARTS:
+                if doctype.pub_id.lower().startswith(string.lower()):
+                    self.quirks_mode = True
+                    return
+        if doctype.sys_id is not None:
+            for string in SYS_ID_EQUALS:
+                if string.lower() == doctype.sys_id.lower():
+                    self.quirks_mode = True
+                    return
+        if doctype.pub_id is not None and doctype.sys_id is None:
+            for string in PUB_ID_STARTS_NO_SYS_ID:
+                if doctype.pub_id.lower().startswith(string.lower()):
+                    self.quirks_mode = True
+                    return
+        if doctype.pub_id is not None and doctype.sys_id is not None:
+            for string in PUB_ID_STARTS_HAS_SYS_ID:
+                if doctype.pub_id.lower().startswith(string.lower()):
+                    self.quirks_mode = True
+                    return
+
+    def initial_anything_else(self):
+        # Parse Error
+        self.quirks_mode = True
+        self.mode = "BEFORE_HTML"
+        self.reprocess = True
+
+    def before_html_char(self):
+        if not self.is_space():
+            self.before_html_anything_else()
+
+    def before_html_start_html(self):
+        node = Node("html", self.token.attrs)
+        self.root.adopt(node)
+        self.open_nodes.append(node)
+        self.mode = "BEFORE_HEAD"
+
+    def before_html_anything_else(self):
+        node = Node("html")
+        self.root.adopt(node)
+        self.open_nodes.append(node)
+        self.mode = "BEFORE_HEAD"
+        self.reprocess = True
+
+    def before_head_char(self):
+        if not self.is_space():
+            self.before_head_anything_else()
+
+    def before_head_start_head(self):
+        node = Node("head", self.token.attrs)
+        self.insert_node(node)
+        self.head = node
+        self.mode = "IN_HEAD"
+
+    def before_head_anything_else(self):
+        node = Node("head")
+        self.insert_node(node)
+        self.head = node
+        self.mode = "IN_HEAD"
+        self.reprocess = True
+
+    def in_head_char(self):
+        if self.is_space():
             self.insert_char(self.token.data)
-        elif self.token.is_comment():
-            pass
-        elif self.token.is_doctype():
-            # Parse Error
-            pass
-        elif self.token.is_start_tag().name == "html":
-            # Parse Error
-            self.in_body_mode()
-        elif self.token.is_start_tag().name in \
-        ("base", "basefont", "bgsound", "link", "meta"):
-            node = Node(self.token.name, self.token.attrs)
-            self.insert_node(node)
-            self.open_nodes.pop()
-        elif self.token.is_start_tag().name == "title":
-            self.parse_raw_text("RCDATA")
-        elif self.token.is_start_tag().name in ("noframes", "style"):
-            self.parse_raw_text("RAWTEXT")
-        elif self.token.is_end_tag().name == "head":
-            self.open_nodes.pop()
-            self.mode = "AFTER_HEAD"
-        elif self.token.is_end_tag().name in ("body", "html", "br"):
-            self.open_nodes.pop()
-            self.mode = "AFTER_HEAD"
-            self.reprocess = True
         else:
-            self.open_nodes.pop()
-            self.mode = "AFTER_HEAD"
-            self.reprocess = True
+            self.in_head_anything_else()
 
-    def after_head_mode(self):
-        if self.token.is_char().data in SPACE_CR:
+    def in_head_start_void(self):
+        node = Node(self.token.name, self.token.attrs)
+        self.insert_node(node)
+        self.open_nodes.pop()
+
+    def in_head_start_title(self):
+        self.parse_raw_text("RCDATA")
+
+    def in_head_start_raw_text(self):
+        self.parse_raw_text("RAWTEXT")
+
+    def in_head_end_head(self):
+        self.open_nodes.pop()
+        self.mode = "AFTER_HEAD"
+
+    def in_head_anything_else(self):
+        self.open_nodes.pop()
+        self.mode = "AFTER_HEAD"
+        self.reprocess = True
+
+    def after_head_char(self):
+        if self.is_space():
             self.insert_char(self.token.data)
-        elif self.token.is_comment():
-            pass
-        elif self.token.is_doctype():
-            # Parse Error
-            pass
-        elif self.token.is_start_tag().name == "html":
-            # Parse Error
-            self.in_body_mode()
-        elif self.token.is_start_tag().name == "body":
-            node = Node("body", self.token.attrs)
-            self.insert_node(node)
-            self.frameset_ok = False
-            self.mode = "IN_BODY"
-        elif self.token.is_start_tag().name == "frameset":
-            node = Node("frameset", self.token.attrs)
-            self.insert_node(node)
-            self.mode = "IN_FRAMESET"
-        elif self.token.is_start_tag().name in \
-        ("base", "basefont", "bgsound", "link", "meta", "noframes",
-        "script", "style", "template", "title"):
-            # Parse Error
-            self.open_nodes.append(self.head)
-            self.in_head_mode()
-            self.open_nodes.pop()
-        elif self.token.is_end_tag().name == "template":
-            self.in_head_mode()
-        elif self.token.is_start_tag().name == "head" or \
-        self.token.is_end_tag().name not in ("<null>", "body",
-        "html", "br"):
-            # Parse Error
-            pass
         else:
-            node = Node("body")
-            self.insert_node(node)
-            self.mode = "IN_BODY"
-            self.reprocess = True
+            self.after_head_anything_else()
+
+    def after_head_start_body(self):
+        node = Node("body", self.token.attrs)
+        self.insert_node(node)
+        self.frameset_ok = False
+        self.mode = "IN_BODY"
+
+    def after_head_start_frameset(self):
+        node = Node("frameset", self.token.attrs)
+        self.insert_node(node)
+        self.mode = "IN_FRAMESET"
+
+    def after_head_start_head_content(self):
+        # Parse Error
+        self.open_nodes.append(self.head)
+        self.in_head_rules()
+        self.open_nodes.pop()
 
-    def in_body_mode(self):
-        if self.token.is_char().data == NULL:
+    def after_head_anything_else(self):
+        node = Node("body")
+        self.insert_node(node)
+        self.mode = "IN_BODY"
+        self.reprocess = True
+
+    def in_body_char(self):
+        data = self.token.data
+        if NULL in data:
             # Parse Error
-            pass
-        elif self.token.is_char().data in SPACE_CR:
-            self.insert_char(self.token.data)
-        elif self.token.is_char():
-            self.insert_char(self.token.data)
+            data = data.replace(NULL, "")
+        if data:
+            self.insert_char(data)
+        if data.strip(SPACE_CR):
             self.frameset_ok = False
-        elif self.token.is_comment():
-            pass
-        elif self.token.is_doctype():
-            # Parse Error
-            pass
-        elif self.token.is_start_tag().name == "html":
-            # Parse Error
-            for node in self.open_nodes:
-                if node.name == "template":
-                    return
-            html_node = self.open_nodes[0]
-            for key, value in self.token.attrs.values():
-                html_node.attrs.setdefault(key, value)
-        elif self.token.is_start_tag().name in \
-        ("base", "basefont", "bgsound", "link", "meta", "noframes",
-        "script", "style", "template", "title") or \
-        self.token.is_end_tag().name == "template":
-            self.in_head_mode()
-        elif self.token.is_start_tag().name in \
-        ("address", "article", "aside", "blockquote", "center",
-        "details", "dialog", "dir", "div", "dl", "fieldset",
-        "figcaption", "figure", "footer", "header", "main", "nav",
-        "ol", "p", "section", "summary", "ul"):
-            node = Node(self.token.name, self.token.attrs)
-            self.insert_node(node)
-        elif self.token.is_start_tag().name in \
-        ("h1", "h2", "h3", "h4", "h5", "h6"):
-            node = Node(self.token.name, self.token.attrs)
-            self.insert_node(node)
-        elif self.token.is_end_tag().name == "p":
-            for node in reversed(self.open_nodes):
-                if node.name == "p":
-                    while self.open_nodes[-1].name != "p":
-                        self.open_nodes.pop()
-                    self.open_nodes.pop()
-                    return
-            # Parse Error
-        elif self.token.is_end_tag().name in \
-        ("h1", "h2", "h3", "h4", "h5", "h6"):
-            for node in reversed(self.open_nodes):
-                if node.name == self.token.name:
-                    while self.open_nodes[-1].name != self.token.name:
-                        self.open_nodes.pop()
+
+    def in_body_start_html(self):
+        # Parse Error
+        for node in self.open_nodes:
+            if node.name == "template":
+                return
+        html_node = self.open_nodes[0]
+        for key, value in self.token.attrs.items():
+            html_node.attrs.setdefault(key, value)
+
+    def in_body_start_block(self):
+        node = Node(self.token.name, self.token.attrs)
+        self.insert_node(node)
+
+    def in_body_end_block(self):
+        for node in reversed(self.open_nodes):
+            if node.name == self.token.name:
+                while self.open_nodes[-1].name != self.token.name:
                     self.open_nodes.pop()
-                    return
-            # Parse Error
+                self.open_nodes.pop()
+                return
+        # Parse Error
 
-    def text_mode(self):
-        if self.token.is_char().data != "<null>":
-            self.insert_char(self.token.data)
-        elif self.token.is_eof():
-            # Parse Error
-            self.open_nodes.pop()
-            self.mode = self.return_mode
-            self.reprocess = True
-        else:
-            self.open_nodes.pop()
-            self.mode = self.return_mode
+    def text_char(self):
+        self.insert_char(self.token.data)
+
+    def text_eof(self):
+        # Parse Error
+        self.open_nodes.pop()
+        self.mode = self.return_mode
+        self.reprocess = True
+
+    def text_anything_else(self):
+        self.open_nodes.pop()
+        self.mode = self.return_mode
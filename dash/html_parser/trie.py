@@ -0,0 +1,33 @@
+class Trie:
+    """
+    Represents a prefix tree over string keys.
+
+    Every node is a dictionary mapping the next character to its
+    child node. A node at the end of a key also holds the key's value
+    under the empty string, which is never a valid character.
+    """
+    def __init__(self, mapping: dict[str, str]=None) -> None:
+        self.root = {}
+        for key, value in (mapping or {}).items():
+            self.insert(key, value)
+
+    def insert(self, key: str, value: str) -> None:
+        """
+        Inserts a key with its value into the tree.
+        """
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = value
+
+    def node(self, prefix: str) -> dict:
+        """
+        Returns the node reached by walking the `prefix`
+        or `None` if no key starts with it.
+        """
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
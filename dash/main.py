@@ -4,5 +4,4 @@ url = "example.org"
 
 app = App()
 app.load_page(url)
-app.render()
 app.run()
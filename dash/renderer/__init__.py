@@ -1 +1,3 @@
 from renderer.render import Renderer
+from renderer.layout import BlockBox, DisplayText, FontMetrics
+from renderer.canvas import CanvasBackend
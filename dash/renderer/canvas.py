@@ -0,0 +1,148 @@
+import tkinter as tk
+from bisect import bisect_left
+from renderer.render import Component, DEFAULT_BG_COLOR
+from renderer.layout import BlockBox, MARGIN, layout, relayout
+
+# Pixels above and below the visible region whose items are drawn
+OVERSCAN = 200
+SCROLL_STEP = 20
+# Milliseconds between two frames handling resizes
+FRAME_DELAY = 16
+
+class CanvasBackend:
+    """
+    Draws components onto a single scrollable canvas through
+    a display list. Only the items near the visible region
+    exist on the canvas at any time.
+    """
+    def __init__(self, win: tk.Tk) -> None:
+        self.scrollbar = tk.Scrollbar(win,
+            orient=tk.VERTICAL,
+            command=self.yview
+        )
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(win,
+            background=DEFAULT_BG_COLOR,
+            highlightthickness=0,
+            yscrollincrement=SCROLL_STEP,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self.schedule_frame)
+        win.bind("<MouseWheel>", self.scroll)
+        win.bind("<Button-4>", self.scroll)
+        win.bind("<Button-5>", self.scroll)
+        self.blocks: list[BlockBox] = []
+        self.tops: list[int] = []
+        self.bottoms: list[int] = []
+        self.items: dict[tuple[int, int], int] = {}
+        self.width = 0
+        self.height = 0
+        self.frame = None
+
+    def paint(self, components: list[Component]) -> None:
+        """
+        Lays out the components and draws the visible part of them.
+        """
+        self.canvas.update_idletasks()
+        self.width = self.canvas.winfo_width()
+        self.blocks = layout(components, self.width)
+        self.canvas.delete(tk.ALL)
+        self.items = {}
+        self.update_extents()
+        self.canvas.yview_moveto(0)
+        self.update_viewport()
+
+    def update_extents(self) -> None:
+        """
+        Updates the block extents used to find visible lines
+        and the scroll region after the blocks have moved.
+        """
+        self.tops = [block.y for block in self.blocks]
+        self.bottoms = [block.y + block.height for block in self.blocks]
+        last = self.blocks[-1] if self.blocks else None
+        self.height = self.bottoms[-1] + last.margin + MARGIN if last else 0
+        self.canvas.configure(scrollregion=(0, 0, self.width, self.height))
+
+    def schedule_frame(self, event: tk.Event=None) -> None:
+        """
+        Schedules a frame unless one is already pending,
+        so bursts of resize events are handled together.
+        """
+        if self.frame is None:
+            self.frame = self.canvas.after(FRAME_DELAY, self.run_frame)
+
+    def run_frame(self) -> None:
+        """
+        Reflows the page if its width changed and updates the viewport.
+        """
+        self.frame = None
+        width = self.canvas.winfo_width()
+        if width != self.width:
+            self.width = width
+            self.reflow()
+        self.update_viewport()
+
+    def reflow(self) -> None:
+        """
+        Reflows the blocks whose lines change at the current width
+        and moves the existing items of all other blocks.
+        """
+        reflowed = relayout(self.blocks, self.width)
+        self.update_extents()
+        for key, item in list(self.items.items()):
+            block, line = key
+            if block in reflowed:
+                self.canvas.delete(self.items.pop(key))
+            else:
+                display = self.blocks[block].display_line(line, self.width)
+                self.canvas.coords(item, display.x, display.y)
+
+    def visible_lines(self, top: int, bottom: int) -> list[tuple[int, int]]:
+        """
+        Returns the block and line indices of the lines
+        which intersect the region between `top` and `bottom`.
+        """
+        lines = []
+        start = bisect_left(self.bottoms, top)
+        end = bisect_left(self.tops, bottom)
+        for index in range(start, end):
+            block = self.blocks[index]
+            first = max((top - block.y) // block.line_height, 0)
+            last = -(-(bottom - block.y) // block.line_height)
+            for line in range(first, min(last, len(block.lines))):
+                lines.append((index, line))
+        return lines
+
+    def update_viewport(self, event: tk.Event=None) -> None:
+        """
+        Draws the lines which came into view
+        and deletes the ones which left it.
+        """
+        top = int(self.canvas.canvasy(0)) - OVERSCAN
+        height = self.canvas.winfo_height()
+        visible = set(self.visible_lines(top, top + height + 2 * OVERSCAN))
+        for key in list(self.items):
+            if key not in visible:
+                self.canvas.delete(self.items.pop(key))
+        for key in visible:
+            if key not in self.items:
+                block, line = key
+                item = self.blocks[block].display_line(line, self.width)
+                self.items[key] = item.draw(self.canvas)
+
+    def yview(self, *args) -> None:
+        """
+        Scrolls the canvas on behalf of the scrollbar.
+        """
+        self.canvas.yview(*args)
+        self.update_viewport()
+
+    def scroll(self, event: tk.Event) -> None:
+        """
+        Scrolls the canvas by a mouse wheel event.
+        """
+        if event.num == 4 or event.delta > 0:
+            self.yview(tk.SCROLL, -1, tk.UNITS)
+        elif event.num == 5 or event.delta < 0:
+            self.yview(tk.SCROLL, 1, tk.UNITS)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import tkinter as tk
+from bisect import bisect_right
+from itertools import accumulate
+from tkinter.font import Font
+from renderer.render import Component, Text
+
+MARGIN = 8
+TEXT_COLOR = "#000000"
+
+class FontMetrics:
+    """
+    Shares font objects and memoizes their text widths,
+    so every word is only measured by Tk once per font.
+    """
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[str, int, str], Font] = {}
+        self.widths: dict[tuple[str, int, str, str], int] = {}
+        self.linespaces: dict[tuple[str, int, str], int] = {}
+
+    def font(self, family: str, size: int, weight: str) -> Font:
+        """
+        Returns the shared font object for the given font.
+        """
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is None:
+            font = Font(family=family, size=size, weight=weight)
+            self.fonts[key] = font
+        return font
+
+    def width(self, family: str, size: int, weight: str, word: str) -> int:
+        """
+        Returns the width of the word in the given font in pixels.
+        """
+        key = (family, size, weight, word)
+        width = self.widths.get(key)
+        if width is None:
+            width = self.font(family, size, weight).measure(word)
+            self.widths[key] = width
+        return width
+
+    def linespace(self, family: str, size: int, weight: str) -> int:
+        """
+        Returns the height of a line in the given font in pixels.
+        """
+        key = (family, size, weight)
+        linespace = self.linespaces.get(key)
+        if linespace is None:
+            linespace = self.font(family, size, weight).metrics("linespace")
+            self.linespaces[key] = linespace
+        return linespace
+
+metrics = FontMetrics()
+
+class DisplayText:
+    """
+    Represents a single line of text in a display list.
+    """
+    def __init__(self,
+        x: int,
+        y: int,
+        height: int,
+        text: str,
+        font: Font,
+        anchor: str=tk.NW
+    ) -> None:
+        self.x = x
+        self.y = y
+        self.height = height
+        self.text = text
+        self.font = font
+        self.anchor = anchor
+
+    def draw(self, canvas: tk.Canvas) -> int:
+        """
+        Draws the text onto the canvas and returns the item ID.
+        """
+        return canvas.create_text(self.x, self.y,
+            text=self.text,
+            font=self.font,
+            anchor=self.anchor,
+            fill=TEXT_COLOR
+        )
+
+class LineBox:
+    """
+    Represents a single line of words inside a block box,
+    holding the words from `start` up to `end`.
+    """
+    def __init__(self, start: int, end: int, width: int) -> None:
+        self.start = start
+        self.end = end
+        self.width = width
+
+class BlockBox:
+    """
+    Represents a text component laid out into line boxes.
+    """
+    def __init__(self, text: Text) -> None:
+        weight = text.emphasis or "normal"
+        font = (text.font, text.size, weight)
+        self.text = text
+        self.font = metrics.font(*font)
+        self.line_height = metrics.linespace(*font)
+        self.space = metrics.width(*font, " ")
+        self.margin = text.margin
+        self.centered = text.justify == tk.CENTER
+        self.words = text.text.split()
+        # The width of the first `i` words including a space after
+        # each of them, so that any line's width is a difference
+        self.offsets = [0, *accumulate(
+            metrics.width(*font, word) + self.space for word in self.words
+        )]
+        self.lines: list[LineBox] = []
+        self.y = 0
+        # The lines stay the same for every width from `fit_width`
+        # up to (but not including) `break_width`
+        self.fit_width = 0
+        self.break_width = 0
+
+    @property
+    def height(self) -> int:
+        """
+        Returns the height of the block's lines.
+        """
+        return len(self.lines) * self.line_height
+
+    def fits(self, width: int) -> bool:
+        """
+        Returns a boolean indicating whether reflowing the block
+        into `width` would produce the same lines as it has now.
+        """
+        return self.fit_width <= width < self.break_width
+
+    def reflow(self, width: int) -> None:
+        """
+        Greedily breaks the words into lines fitting into `width`.
+        """
+        self.lines = []
+        self.fit_width = 0
+        self.break_width = float("inf")
+        offsets = self.offsets
+        space = self.space
+        count = len(self.words)
+        start = 0
+        while start < count:
+            # The last word which still fits, but at least one word
+            limit = offsets[start] + width + space
+            end = max(bisect_right(offsets, limit, start + 1) - 1, start + 1)
+            line_width = offsets[end] - offsets[start] - space
+            self.lines.append(LineBox(start, end, line_width))
+            # A single word is placed on its line even if it overflows
+            if end - start > 1:
+                self.fit_width = max(self.fit_width, line_width)
+            if end < count:
+                overflow = offsets[end + 1] - offsets[start] - space
+                self.break_width = min(self.break_width, overflow)
+            start = end
+
+    def display_line(self, index: int, width: int) -> DisplayText:
+        """
+        Returns the display list item of a line
+        for a viewport which is `width` pixels wide.
+        """
+        line = self.lines[index]
+        y = self.y + index * self.line_height
+        if self.centered:
+            x, anchor = width // 2, tk.N
+        else:
+            x, anchor = MARGIN, tk.NW
+        text = " ".join(self.words[line.start:line.end])
+        return DisplayText(x, y, self.line_height, text, self.font, anchor)
+
+def line_width(width: int) -> int:
+    """
+    Returns the width available to lines
+    in a viewport `width` pixels wide.
+    """
+    return max(width - 2 * MARGIN, 1)
+
+def stack(blocks: list[BlockBox]) -> int:
+    """
+    Positions the block boxes below each other
+    and returns the total height.
+    """
+    y = MARGIN
+    for block in blocks:
+        y += block.margin
+        block.y = y
+        y += block.height + block.margin
+    return y + MARGIN
+
+def layout(components: list[Component], width: int) -> list[BlockBox]:
+    """
+    Lays out the components into block boxes stacked
+    below each other in a viewport `width` pixels wide.
+    """
+    blocks = []
+    for component in components:
+        if not isinstance(component, Text):
+            continue
+        block = BlockBox(component)
+        block.reflow(line_width(width))
+        blocks.append(block)
+    stack(blocks)
+    return blocks
+
+def relayout(blocks: list[BlockBox], width: int) -> set[int]:
+    """
+    Lays out the block boxes again for a viewport `width` pixels
+    wide. Only blocks whose lines change are reflowed; the indices
+    of these blocks are returned.
+    """
+    reflowed = set()
+    width = line_width(width)
+    for index, block in enumerate(blocks):
+        if not block.fits(width):
+            block.reflow(width)
+            reflowed.add(index)
+    stack(blocks)
+    return reflowed
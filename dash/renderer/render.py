@@ -1,10 +1,13 @@
 import tkinter as tk
-from dom import Document
+from dom import Document, Node, TreeWalker
 
 DEFAULT_FONT = "Times New Roman"
 DEFAULT_SIZE = 16
 DEFAULT_BG_COLOR = "#ffffff"
 
+# Elements whose contents are never rendered
+HIDDEN = ("head", "script", "style")
+
 DEFAULTS = {
     "h1": {
         "font": "Times New Roman",
@@ -12,12 +15,14 @@ DEFAULTS = {
         "emphasis": "bold",
         "justify": tk.CENTER,
         "anchor": tk.CENTER,
+        "margin": 12,
     },
     "p": {
         "font": "Times New Roman",
         "size": 16,
         "justify": tk.LEFT,
-        "anchor": tk.W
+        "anchor": tk.W,
+        "margin": 8,
     }
 }
 
@@ -42,6 +47,7 @@ class Text(Component):
         side: str=tk.TOP,
         anchor: str=tk.W,
         justify: str=tk.LEFT,
+        margin: int=0,
         background: str=DEFAULT_BG_COLOR
     ) -> None:
         self.text = text
@@ -51,6 +57,7 @@ class Text(Component):
         self.side = side
         self.anchor = anchor
         self.justify = justify
+        self.margin = margin
         self.background = background
 
     def draw(self, win: tk.Tk) -> None:
@@ -63,7 +70,13 @@ class Text(Component):
             justify=self.justify,
             background=self.background
         )
-        text.pack(side=self.side, anchor=self.anchor)
+        text.pack(side=self.side, anchor=self.anchor, pady=self.margin)
+
+def visible_filter(node: Node) -> int:
+    """
+    Rejects the subtrees of elements which are never rendered.
+    """
+    return TreeWalker.REJECT if node.name in HIDDEN else TreeWalker.ACCEPT
 
 class Renderer:
     """
@@ -73,20 +86,29 @@ class Renderer:
         pass
 
     def render(self, document: Document) -> list[Component]:
+        """
+        Renders the document into components in a single traversal.
+        Text belongs to the innermost block element containing it.
+        """
         components = []
-        for elem in document.root.walk():
-            if elem.name == "h1":
-                text = ""
-                for child in elem.walk():
-                    if child.is_text():
-                        text += child.data
-                text = Text(text=text, **DEFAULTS["h1"])
-                components.append(text)
-            elif elem.name == "p":
-                text = ""
-                for child in elem.walk():
-                    if child.is_text():
-                        text += child.data
-                text = Text(text=text, **DEFAULTS["p"])
-                components.append(text)
+        # The ancestors of the current node and the open block elements
+        # with their components and collected text runs
+        path = [document.root]
+        blocks = []
+        for node in TreeWalker(document.root, visible_filter):
+            while path and path[-1] is not node.parent:
+                closed = path.pop()
+                if blocks and blocks[-1][0] is closed:
+                    _, component, runs = blocks.pop()
+                    component.text = "".join(runs)
+            path.append(node)
+            if text := node.is_text():
+                if blocks:
+                    blocks[-1][2].append(text.data)
+            elif node.name in DEFAULTS:
+                component = Text(text="", **DEFAULTS[node.name])
+                components.append(component)
+                blocks.append((node, component, []))
+        for _, component, runs in blocks:
+            component.text = "".join(runs)
         return components
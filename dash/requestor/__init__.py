@@ -1,8 +1,13 @@
 from requestor.url import Url, UrlError, SchemeError, PortError
+from requestor.headers import Headers
 from requestor.response import Response
+from requestor.pool import ConnectionPool, shared_pool
+from requestor.tls import SessionCache, shared_sessions
 from requestor.http import \
     Client as HttpClient, \
     Connection as HttpConnection
 from requestor.https import \
     Client as HttpsClient, \
     Connection as HttpsConnection
+from requestor.cache import HttpCache, CacheEntry, shared_cache
+from requestor.hsts import HstsStore, shared_hsts
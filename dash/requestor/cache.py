@@ -0,0 +1,470 @@
+from __future__ import annotations
+import json
+import os
+from email.utils import parsedate_to_datetime
+from hashlib import sha256
+from threading import Lock
+from time import time
+from requestor.url import Url
+from requestor.response import Response
+from requestor.headers import Headers
+from requestor.storage import cache_home, write_atomically
+from requestor.http import \
+    Client as HttpClient, \
+    Connection as HttpConnection
+from requestor.https import Client as HttpsClient
+
+# https://httpwg.org/specs/rfc9111.html
+
+# Responses kept in memory, the rest is only on disk
+MEMORY_ENTRIES = 64
+# Responses with larger bodies are not stored
+MAX_ENTRY_SIZE = 8 * 1024 * 1024
+# Bytes the disk tier may take up before the least
+# recently used entries are evicted
+DISK_BYTES = 256 * 1024 * 1024
+# Without explicit freshness, a response is fresh for this fraction
+# of the time since it was last modified, but at most a day
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_LIFETIME = 24 * 60 * 60
+# Status codes which are cacheable by default
+CACHEABLE_CODES = (200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501)
+# Suffix of the file holding an entry's metadata next to its body
+META_SUFFIX = ".meta"
+# Headers of a 304 response which do not replace the stored ones
+KEPT_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+def default_directory() -> str:
+    """
+    Returns the directory of the disk cache of the user.
+    """
+    return os.path.join(cache_home(), "http")
+
+def directives(headers: Headers) -> dict[str, str]:
+    """
+    Parses the Cache-Control header into a dictionary
+    of directives, whose values may be `None`.
+    """
+    parsed = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.partition("=")
+        if name.strip():
+            parsed[name.strip().lower()] = value.strip().strip('"') or None
+    return parsed
+
+def parse_date(value: str) -> float:
+    """
+    Parses an HTTP date into a timestamp, or returns `None`.
+    """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+class CacheEntry:
+    """
+    Represents a stored response along with
+    the times needed to compute its age.
+    """
+    def __init__(self,
+        url: str,
+        version: int,
+        code: int,
+        reason: str,
+        headers: Headers,
+        body: bytes,
+        request_time: float,
+        response_time: float
+    ) -> None:
+        self.url = url
+        self.version = version
+        self.code = code
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.request_time = request_time
+        self.response_time = response_time
+
+    @classmethod
+    def from_response(cls, url: str, resp: Response):
+        """
+        Creates an entry from a response whose body has been read.
+        """
+        # The body is stored decompressed
+        return cls(url, resp.version, resp.code, resp.reason,
+            resp.headers.without("Content-Encoding"), resp.body,
+            resp.request_time, resp.response_time
+        )
+
+    def response(self) -> Response:
+        """
+        Returns a response with the stored contents.
+        """
+        return Response.stored(self.version, self.code, self.reason,
+            self.headers, self.body
+        )
+
+    def date(self) -> float:
+        """
+        Returns the time the response was generated at.
+        """
+        return parse_date(self.headers.get("Date")) or self.response_time
+
+    def lifetime(self) -> float:
+        """
+        Returns the freshness lifetime of the response in seconds.
+        """
+        max_age = directives(self.headers).get("max-age")
+        if max_age is not None:
+            return int(max_age) if max_age.isdigit() else 0
+        expires = self.headers.get("Expires")
+        if expires is not None:
+            # An invalid date means that the response has expired
+            expires = parse_date(expires)
+            return max(expires - self.date(), 0) if expires else 0
+        last_modified = parse_date(self.headers.get("Last-Modified"))
+        if last_modified and self.code in CACHEABLE_CODES:
+            lifetime = (self.date() - last_modified) * HEURISTIC_FRACTION
+            return min(max(lifetime, 0), MAX_HEURISTIC_LIFETIME)
+        return 0
+
+    def age(self, now: float) -> float:
+        """
+        Returns the current age of the response in seconds.
+        """
+        apparent_age = max(self.response_time - self.date(), 0)
+        age = self.headers.get("Age") or ""
+        age = int(age) if age.isdigit() else 0
+        corrected_age = age + self.response_time - self.request_time
+        return max(apparent_age, corrected_age) + now - self.response_time
+
+    def fresh(self) -> bool:
+        """
+        Returns a boolean indicating whether the response
+        can be used without contacting the server.
+        """
+        if "no-cache" in directives(self.headers):
+            return False
+        return self.lifetime() > self.age(time())
+
+    def validators(self) -> dict[str, str]:
+        """
+        Returns the headers of a conditional request
+        which revalidates the response.
+        """
+        headers = {}
+        etag = self.headers.get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+        last_modified = self.headers.get("Last-Modified")
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def update(self, resp: Response) -> None:
+        """
+        Updates the entry with a 304 Not Modified response.
+        """
+        updated = [
+            (name, value) for name, value in resp.headers.items()
+            if name.lower() not in KEPT_HEADERS
+        ]
+        headers = self.headers.without(*(name for name, _ in updated))
+        self.headers = Headers(headers.items() + updated)
+        self.request_time = resp.request_time
+        self.response_time = resp.response_time
+
+    def dump_meta(self) -> bytes:
+        """
+        Serializes everything but the body for the disk cache.
+        The body's size is included to detect a body which
+        does not belong to the metadata.
+        """
+        return json.dumps({
+            "url": self.url,
+            "version": self.version,
+            "code": self.code,
+            "reason": self.reason,
+            "headers": self.headers.items(),
+            "request_time": self.request_time,
+            "response_time": self.response_time,
+            "size": len(self.body)
+        }).encode()
+
+    @classmethod
+    def load(cls, meta: bytes, body: bytes):
+        """
+        Deserializes an entry from the disk cache,
+        or returns `None` if the body does not match.
+        """
+        meta = json.loads(meta)
+        if meta.pop("size") != len(body):
+            return None
+        meta["headers"] = Headers(map(tuple, meta["headers"]))
+        return cls(body=body, **meta)
+
+class HttpCache:
+    """
+    A private HTTP cache keeping responses in memory
+    and, if it has a directory, on disk.
+    """
+    def __init__(self,
+        directory: str=None,
+        memory_entries: int=MEMORY_ENTRIES,
+        disk_bytes: int=DISK_BYTES
+    ) -> None:
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        # The bytes taken up on disk, unknown until the first write
+        self.disk_usage: int = None
+        # When entries served from memory were last used by their path,
+        # as their files' modification times only change on disk access
+        self.used: dict[str, float] = {}
+        # The most recently used entries are last
+        self.memory: dict[str, CacheEntry] = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def __repr__(self) -> str:
+        return f"<HttpCache hits={self.hits} misses={self.misses} \
+revalidations={self.revalidations} not_modified={self.not_modified}>"
+
+    def fetch(self,
+        client: HttpClient | HttpsClient,
+        url: Url,
+        conn: HttpConnection=None
+    ) -> tuple[Response, HttpConnection]:
+        """
+        Returns a response to a GET request for the `url` from
+        the `client` along with the connection it came over,
+        which is `conn` if an open connection to the origin
+        is passed. A fresh stored response is returned without
+        connecting, along with `conn`. A stale one is revalidated
+        with a conditional request.
+
+        Responses from the network are streamed; they should be
+        passed to `store` once their body has been read.
+        """
+        client.complete(url)
+        key = str(url)
+        entry = self.lookup(key)
+        if entry and entry.fresh():
+            with self.lock:
+                self.hits += 1
+            return entry.response(), conn
+
+        conn = conn or client.connect(url)
+        headers = entry.validators() if entry else {}
+        with self.lock:
+            if headers:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+        resp = conn.get(url.path, headers=headers, stream=True)
+        if headers and resp.code == 304:
+            resp.read()
+            entry.update(resp)
+            # Only the headers and times have changed
+            self.save(entry, body=False)
+            with self.lock:
+                self.not_modified += 1
+            return entry.response(), conn
+        # The stale entry is replaced by the new response if that
+        # can be stored once read, and must not be used otherwise
+        if entry:
+            self.remove(key)
+        if self.storable(resp):
+            resp.keep(MAX_ENTRY_SIZE)
+        return resp, conn
+
+    def store(self, url: Url, resp: Response) -> None:
+        """
+        Stores a response fetched from the network whose
+        body has been read, if it may be stored.
+        """
+        if resp.cached or resp.discarded or resp.body is None \
+        or len(resp.body) > MAX_ENTRY_SIZE or not self.storable(resp):
+            return
+        self.save(CacheEntry.from_response(str(url), resp))
+
+    @staticmethod
+    def storable(resp: Response) -> bool:
+        """
+        Returns a boolean indicating whether the response
+        may be stored and could be used later.
+        """
+        if resp.code not in CACHEABLE_CODES \
+        or "no-store" in directives(resp.headers) \
+        or resp.headers.get("Vary") == "*":
+            return False
+        length = resp.headers.get("Content-Length") or ""
+        if length.isdigit() and int(length) > MAX_ENTRY_SIZE:
+            return False
+        entry = CacheEntry.from_response("", resp)
+        return entry.lifetime() > 0 or bool(entry.validators())
+
+    def lookup(self, key: str) -> CacheEntry:
+        """
+        Returns the entry stored for the key, or `None`.
+        """
+        with self.lock:
+            entry = self.memory.pop(key, None)
+            if entry:
+                self.memory[key] = entry
+                if self.directory:
+                    self.used[self.path(key)] = time()
+                return entry
+        entry = self.read(key)
+        if entry:
+            self.remember(entry)
+        return entry
+
+    def save(self, entry: CacheEntry, body: bool=True) -> None:
+        """
+        Stores the entry in memory and on disk. Unless `body`
+        is true, the body on disk is left as it is.
+        """
+        self.remember(entry)
+        self.write(entry, body)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the entry stored for the key.
+        """
+        with self.lock:
+            self.memory.pop(key, None)
+        if self.directory:
+            path = self.path(key)
+            with self.lock:
+                self.used.pop(path, None)
+            size = 0
+            for file in (path, path + META_SUFFIX):
+                try:
+                    file_size = os.path.getsize(file)
+                    os.remove(file)
+                except OSError:
+                    continue
+                size += file_size
+            self.account(-size)
+
+    def clear(self) -> None:
+        """
+        Removes all entries from memory, leaving the disk alone.
+        """
+        with self.lock:
+            self.memory = {}
+
+    def remember(self, entry: CacheEntry) -> None:
+        """
+        Stores the entry in memory, evicting
+        the least recently used one if necessary.
+        """
+        with self.lock:
+            self.memory.pop(entry.url, None)
+            self.memory[entry.url] = entry
+            if len(self.memory) > self.memory_entries:
+                del self.memory[next(iter(self.memory))]
+
+    def path(self, key: str) -> str:
+        """
+        Returns the path of the file storing the key's body,
+        whose metadata is stored with `META_SUFFIX` appended.
+        """
+        return os.path.join(self.directory, sha256(key.encode()).hexdigest())
+
+    def read(self, key: str) -> CacheEntry:
+        """
+        Reads the entry stored for the key from disk, or returns `None`.
+        """
+        if not self.directory:
+            return None
+        path = self.path(key)
+        try:
+            with open(path + META_SUFFIX, "rb") as file:
+                meta = file.read()
+            with open(path, "rb") as file:
+                entry = CacheEntry.load(meta, file.read())
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        return entry if entry and entry.url == key else None
+
+    def write(self, entry: CacheEntry, body: bool=True) -> None:
+        """
+        Writes the entry to disk, replacing an older one. The metadata
+        is written last, so that it is never newer than the body.
+        """
+        if not self.directory:
+            return
+        path = self.path(entry.url)
+        files = [(path + META_SUFFIX, entry.dump_meta())]
+        if body:
+            files.insert(0, (path, entry.body))
+        change = 0
+        for file, data in files:
+            try:
+                replaced = os.path.getsize(file)
+            except OSError:
+                replaced = 0
+            if not write_atomically(file, data):
+                break
+            change += len(data) - replaced
+        self.account(change)
+
+    def account(self, change: int) -> None:
+        """
+        Records a change of the bytes taken up on disk and evicts
+        entries if they no longer fit into the budget.
+        """
+        with self.lock:
+            if self.disk_usage is not None:
+                self.disk_usage += change
+            over = self.disk_usage is None or self.disk_usage > self.disk_bytes
+        if over:
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Evicts the least recently used entries from disk
+        until the rest fits into the budget.
+        """
+        # The last use and size of each entry's files by its body's path
+        entries: dict[str, tuple[float, int]] = {}
+        with self.lock:
+            used = dict(self.used)
+        try:
+            with os.scandir(self.directory) as files:
+                for file in files:
+                    if not file.is_file() or file.name.endswith(".tmp"):
+                        continue
+                    path = file.path.removesuffix(META_SUFFIX)
+                    stat = file.stat()
+                    last_used, size = entries.get(path, (used.get(path, 0), 0))
+                    entries[path] = (
+                        max(last_used, stat.st_mtime), size + stat.st_size
+                    )
+        except OSError:
+            return
+        usage = sum(size for _, size in entries.values())
+        for path, (_, size) in sorted(entries.items(), key=lambda e: e[1]):
+            if usage <= self.disk_bytes:
+                break
+            for file in (path, path + META_SUFFIX):
+                try:
+                    os.remove(file)
+                except OSError:
+                    pass
+            usage -= size
+            with self.lock:
+                self.used.pop(path, None)
+        with self.lock:
+            self.disk_usage = usage
+
+shared_cache = HttpCache(default_directory())
@@ -0,0 +1,73 @@
+from collections.abc import Iterable, Iterator
+
+class Headers:
+    """
+    Represents the header fields of a message as a multimap
+    with case-insensitive names. The fields are kept in the
+    order received; they are only indexed once one is looked up.
+    """
+    def __init__(self, fields: Iterable[tuple[str, str]]=()) -> None:
+        self.fields = list(fields)
+        self.index: dict[str, list[str]] = None
+
+    def __repr__(self) -> str:
+        return "\n".join(f"{name}: {value}" for name, value in self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self.fields)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.indexed()
+
+    def __getitem__(self, name: str) -> str:
+        """
+        Returns the value of the field, combining repeated
+        fields into a comma-separated list.
+        """
+        values = self.indexed().get(name.lower())
+        if values is None:
+            raise KeyError(name)
+        return ", ".join(values)
+
+    def indexed(self) -> dict[str, list[str]]:
+        """
+        Returns the values of the fields by their lowercase names,
+        building the index on first use.
+        """
+        if self.index is None:
+            self.index = {}
+            for name, value in self.fields:
+                self.index.setdefault(name.lower(), []).append(value)
+        return self.index
+
+    def get(self, name: str, default: str=None) -> str:
+        """
+        Returns the value of the field, or `default` if it is missing.
+        """
+        return self[name] if name in self else default
+
+    def get_all(self, name: str) -> list[str]:
+        """
+        Returns the values of every field with the name,
+        such as all of the cookies in Set-Cookie fields.
+        """
+        return list(self.indexed().get(name.lower(), ()))
+
+    def items(self) -> list[tuple[str, str]]:
+        """
+        Returns the names and values of all fields, including repeated ones.
+        """
+        return list(self.fields)
+
+    def without(self, *names: str):
+        """
+        Returns a copy of the headers without the fields with the names.
+        """
+        names = {name.lower() for name in names}
+        return Headers(
+            (name, value) for name, value in self.fields
+            if name.lower() not in names
+        )
@@ -0,0 +1,176 @@
+import json
+import os
+from re import compile as regex
+from threading import Lock
+from time import time
+from requestor.url import Url, HTTP_SCHEME, HTTPS_SCHEME, HTTP_PORT
+from requestor.response import Response
+from requestor.storage import cache_home, write_atomically
+
+# https://www.rfc-editor.org/rfc/rfc6797
+
+# Seconds a host is upgraded for after redirecting from HTTP to HTTPS
+# itself, which is weaker evidence than a Strict-Transport-Security header
+UPGRADE_MAX_AGE = 24 * 60 * 60
+# Seconds an expiry time has to move by before the hosts are saved again,
+# since most responses of a host repeat its header with a later expiry
+SAVE_THRESHOLD = 24 * 60 * 60
+
+max_age_regex = regex(r"(?i)(?:^|;)\s*max-age\s*=\s*\"?(\d+)\"?\s*(?:;|$)")
+subdomains_regex = regex(r"(?i)(?:^|;)\s*includesubdomains\s*(?:;|$)")
+
+class HstsStore:
+    """
+    Keeps the hosts known to only be reachable over HTTPS,
+    so that HTTP URLs to them can be upgraded before connecting.
+    With a path, the hosts are also kept on disk.
+    """
+    def __init__(self, path: str=None) -> None:
+        self.path = path
+        # The expiry time and whether subdomains are included by host
+        self.hosts: dict[str, tuple[float, bool]] = None
+        # The hosts as last read from or written to disk
+        self.saved: dict[str, tuple[float, bool]] = {}
+        self.lock = Lock()
+        self.upgrades = 0
+
+    def __repr__(self) -> str:
+        return f"<HstsStore hosts={len(self.hosts or ())} \
+upgrades={self.upgrades}>"
+
+    def upgrade(self, url: Url) -> bool:
+        """
+        Switches an HTTP `url` to a known HTTPS-only host to HTTPS.
+        Returns a boolean indicating whether the `url` was upgraded.
+        """
+        if url.scheme != HTTP_SCHEME or not self.secure(url.domain):
+            return False
+        url.scheme = HTTPS_SCHEME
+        if url.port == HTTP_PORT:
+            url.port = None
+        with self.lock:
+            self.upgrades += 1
+        return True
+
+    def secure(self, host: str) -> bool:
+        """
+        Returns a boolean indicating whether
+        the host is known to be HTTPS-only.
+        """
+        host = host.lower()
+        now = time()
+        with self.lock:
+            self.load()
+            expires, _ = self.hosts.get(host, (0, False))
+            if expires > now:
+                return True
+            # A parent domain may include its subdomains
+            parts = host.split(".")
+            for index in range(1, len(parts) - 1):
+                expires, subdomains = self.hosts.get(
+                    ".".join(parts[index:]), (0, False)
+                )
+                if subdomains and expires > now:
+                    return True
+        return False
+
+    def observe(self, url: Url, resp: Response) -> None:
+        """
+        Records the Strict-Transport-Security header of a response.
+        The header is only trusted if received over HTTPS.
+        """
+        if url.scheme != HTTPS_SCHEME:
+            return
+        policy = resp.headers.get("Strict-Transport-Security")
+        if policy is None:
+            return
+        max_age = max_age_regex.search(policy)
+        if not max_age:
+            return
+        subdomains = bool(subdomains_regex.search(policy))
+        self.add(url.domain, int(max_age[1]), subdomains)
+
+    def observe_redirect(self, url: Url, target: Url) -> None:
+        """
+        Records a redirect from HTTP to HTTPS on the same host.
+        """
+        if url.scheme == HTTP_SCHEME and target.scheme == HTTPS_SCHEME \
+        and url.domain.lower() == target.domain.lower():
+            with self.lock:
+                self.load()
+                expires, _ = self.hosts.get(url.domain.lower(), (0, False))
+            # A header policy is not shortened by a redirect
+            if expires < time() + UPGRADE_MAX_AGE:
+                self.add(url.domain, UPGRADE_MAX_AGE, False)
+
+    def add(self, host: str, max_age: int, subdomains: bool) -> None:
+        """
+        Marks the host as HTTPS-only for `max_age` seconds.
+        A `max_age` of 0 removes the host. The hosts are only
+        saved if the change is meaningful.
+        """
+        host = host.lower()
+        with self.lock:
+            self.load()
+            if max_age:
+                self.hosts[host] = (time() + max_age, subdomains)
+            elif host in self.hosts:
+                del self.hosts[host]
+            else:
+                return
+            if self.changed(host):
+                self.save()
+
+    def changed(self, host: str) -> bool:
+        """
+        Returns a boolean indicating whether the host has been added,
+        removed, changed whether its subdomains are included or moved
+        its expiry time by more than `SAVE_THRESHOLD` since last saved.
+        The lock must be held.
+        """
+        if (host in self.hosts) != (host in self.saved):
+            return True
+        if host not in self.hosts:
+            return False
+        expires, subdomains = self.hosts[host]
+        saved_expires, saved_subdomains = self.saved[host]
+        return subdomains != saved_subdomains \
+        or abs(expires - saved_expires) > SAVE_THRESHOLD
+
+    def load(self) -> None:
+        """
+        Reads the hosts from disk on first use.
+        The lock must be held.
+        """
+        if self.hosts is not None:
+            return
+        self.hosts = {}
+        if not self.path:
+            return
+        try:
+            with open(self.path) as file:
+                hosts = json.load(file)
+            now = time()
+            for host, (expires, subdomains) in hosts.items():
+                if expires > now:
+                    self.hosts[host] = (float(expires), bool(subdomains))
+        except (OSError, ValueError, TypeError, AttributeError):
+            # Hosts are learned again from the responses
+            pass
+        self.saved = dict(self.hosts)
+
+    def save(self) -> None:
+        """
+        Writes the unexpired hosts to disk. The lock must be held.
+        """
+        if not self.path:
+            return
+        now = time()
+        hosts = {
+            host: entry for host, entry in self.hosts.items()
+            if entry[0] > now
+        }
+        if write_atomically(self.path, json.dumps(hosts).encode()):
+            self.saved = hosts
+
+shared_hsts = HstsStore(os.path.join(cache_home(), "hsts.json"))
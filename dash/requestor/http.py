@@ -1,6 +1,8 @@
 import http.client as http
+from time import time
 from requestor.url import Url
-from requestor.response import Response
+from requestor.response import Response, ACCEPT_ENCODING
+from requestor.pool import ConnectionPool, shared_pool
 
 TIMEOUT = 5
 
@@ -12,17 +14,55 @@ class Connection:
         self._conn = conn
         self.url = url
         self.user_agent = None
+        self.pool: ConnectionPool = None
+        self.reused = False
+        self.response: Response = None
 
-    def get(self, path: str, body: str=None, headers: dict[str, str]=None):
+    def get(self,
+        path: str,
+        body: str=None,
+        headers: dict[str, str]=None,
+        stream: bool=False
+    ) -> Response:
         """
-        Sends a GET request to the given URL `path`.
+        Sends a GET request to the given URL `path`. If `stream` is
+        true, the response body is left to be read in chunks.
         """
         headers = headers or {}
         if self.user_agent:
             headers.setdefault("User-Agent", self.user_agent)
-        self._conn.request("GET", path, body, headers)
-        resp = self._conn.getresponse()
-        return Response(resp)
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        sent = time()
+        try:
+            self._conn.request("GET", path, body, headers)
+            resp = self._conn.getresponse()
+        except ConnectionError:
+            # The server may close an idle connection at any time,
+            # so a request on a reused one is retried once
+            if not self.reused:
+                raise
+            self._conn.close()
+            self.reused = False
+            self._conn.request("GET", path, body, headers)
+            resp = self._conn.getresponse()
+        self.response = Response(resp, stream, sent)
+        return self.response
+
+    def origin(self) -> tuple[str, str, int]:
+        """
+        Returns the scheme, domain and port the connection is to.
+        """
+        return (self.url.scheme, self.url.domain, self.url.port)
+
+    def release(self) -> None:
+        """
+        Returns the connection to its pool for reuse, or closes it
+        if it does not belong to one or its response is unread.
+        """
+        if self.pool and (not self.response or self.response.complete()):
+            self.pool.release(self.origin(), self._conn)
+        else:
+            self.close()
 
     def close(self) -> None:
         """
@@ -34,20 +74,34 @@ class Client:
     """
     Provides an interface for establishing HTTP connections.
     """
-    def __init__(self) -> None:
+    def __init__(self, pool: ConnectionPool=shared_pool) -> None:
         self.user_agent = None
+        self.pool = pool
 
-    def connect(self, url: Url) -> Connection:
+    def complete(self, url: Url) -> None:
         """
-        Connects to the `url`.
+        Validates the `url` and fills in its missing parts.
         """
         url.validate()
         url.http_complete()
 
-        conn = http.HTTPConnection(
-            url.domain, url.port, TIMEOUT
-        )
+    def connect(self, url: Url) -> Connection:
+        """
+        Connects to the `url`, reusing an idle connection
+        from the pool if there is one.
+        """
+        self.complete(url)
+
+        conn = self.pool.acquire((url.scheme, url.domain, url.port)) \
+        if self.pool else None
+        reused = conn is not None
+        if not reused:
+            conn = http.HTTPConnection(
+                url.domain, url.port, TIMEOUT
+            )
         connection = Connection(conn, url)
+        connection.pool = self.pool
+        connection.reused = reused
         if self.user_agent:
             connection.user_agent = self.user_agent
         return connection
@@ -1,7 +1,9 @@
 import http.client as http
-from ssl import create_default_context
 from requestor.url import Url
 from requestor.http import Connection as HttpConnection
+from requestor.pool import ConnectionPool, shared_pool
+from requestor.tls import HTTPSConnection, SessionCache, \
+    context, shared_sessions
 
 TIMEOUT = 5
 
@@ -16,24 +18,43 @@ class Client:
     """
     Provides an interface for establishing HTTPS connections.
     """
-    def __init__(self) -> None:
-        self.ssl = create_default_context()
+    def __init__(self,
+        pool: ConnectionPool=shared_pool,
+        sessions: SessionCache=shared_sessions
+    ) -> None:
+        self.ssl = context()
         self.user_agent = None
+        self.pool = pool
+        self.sessions = sessions
 
-    def connect(self, url: Url) -> Connection:
+    def complete(self, url: Url) -> None:
         """
-        Connects to the `url`.
+        Validates the `url` and fills in its missing parts.
         """
         url.validate()
         url.https_complete()
 
-        conn = http.HTTPSConnection(
-            url.domain,
-            url.port,
-            timeout=TIMEOUT,
-            context=self.ssl
-        )
+    def connect(self, url: Url) -> Connection:
+        """
+        Connects to the `url`, reusing an idle connection
+        from the pool if there is one.
+        """
+        self.complete(url)
+
+        conn = self.pool.acquire((url.scheme, url.domain, url.port)) \
+        if self.pool else None
+        reused = conn is not None
+        if not reused:
+            conn = HTTPSConnection(
+                url.domain,
+                url.port,
+                timeout=TIMEOUT,
+                context=self.ssl,
+                sessions=self.sessions
+            )
         connection = Connection(conn, url)
+        connection.pool = self.pool
+        connection.reused = reused
         if self.user_agent:
             connection.user_agent = self.user_agent
         return connection
@@ -0,0 +1,95 @@
+import http.client as http
+from select import select
+from threading import Lock
+from time import monotonic
+
+# Idle connections kept per origin
+MAX_IDLE = 4
+# Seconds after which an idle connection is closed
+IDLE_TIMEOUT = 30
+
+Origin = tuple[str, str, int]
+
+class ConnectionPool:
+    """
+    Keeps idle keep-alive connections per origin, so that
+    further requests to the same origin skip connecting.
+    """
+    def __init__(self,
+        max_idle: int=MAX_IDLE,
+        idle_timeout: float=IDLE_TIMEOUT
+    ) -> None:
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        # The most recently released connections are last
+        self.idle: dict[Origin, list[tuple[float, http.HTTPConnection]]] = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def __repr__(self) -> str:
+        idle = sum(len(conns) for conns in self.idle.values())
+        return f"<ConnectionPool hits={self.hits} misses={self.misses} \
+discarded={self.discarded} idle={idle}>"
+
+    def acquire(self, origin: Origin) -> http.HTTPConnection:
+        """
+        Takes an idle connection to the origin out of the pool.
+        Returns `None` if there is no usable connection.
+        """
+        with self.lock:
+            conns = self.idle.get(origin, [])
+            while conns:
+                released, conn = conns.pop()
+                if monotonic() - released < self.idle_timeout \
+                and self.healthy(conn):
+                    self.hits += 1
+                    return conn
+                conn.close()
+                self.discarded += 1
+            self.misses += 1
+            return None
+
+    def release(self, origin: Origin, conn: http.HTTPConnection) -> None:
+        """
+        Puts the connection back into the pool for reuse,
+        unless it has been closed.
+        """
+        if conn.sock is None:
+            return
+        with self.lock:
+            conns = self.idle.setdefault(origin, [])
+            conns.append((monotonic(), conn))
+            if len(conns) > self.max_idle:
+                _, oldest = conns.pop(0)
+                oldest.close()
+                self.discarded += 1
+
+    def clear(self) -> None:
+        """
+        Closes all idle connections.
+        """
+        with self.lock:
+            for conns in self.idle.values():
+                for _, conn in conns:
+                    conn.close()
+            self.idle = {}
+
+    @staticmethod
+    def healthy(conn: http.HTTPConnection) -> bool:
+        """
+        Returns a boolean indicating whether an idle connection
+        can still be used. An idle socket should have nothing
+        to read; if it has, the server has closed it or sent
+        data which does not belong to any request.
+        """
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+shared_pool = ConnectionPool()
@@ -1,24 +1,120 @@
 import http.client as http
+from codecs import IncrementalDecoder, getincrementaldecoder
+from collections.abc import Iterator
 from re import compile as regex
+from time import time
+from zlib import MAX_WBITS, decompressobj, error as ZlibError
+from requestor.headers import Headers
 
 DEFAULT_CHARSET = "utf-8"
+# Bytes read from the socket at once when streaming
+CHUNK_SIZE = 16384
+ACCEPT_ENCODING = "gzip, deflate"
+# Window bits of zlib for the gzip, zlib and raw deflate formats
+GZIP_WBITS = 16 + MAX_WBITS
+ZLIB_WBITS = MAX_WBITS
+RAW_WBITS = -MAX_WBITS
 
 headers_regex = regex(r"^[ \t]*(?P<name>[a-zA-Z0-9-]+):[ \t]*(?P<value>.+)$")
 charset_regex = regex(r"charset=([a-zA-Z0-9-_]+)")
 
+class ContentDecoder:
+    """
+    Decompresses a gzip or deflate encoded body incrementally.
+    """
+    def __init__(self, encoding: str) -> None:
+        gzip = encoding in ("gzip", "x-gzip")
+        self.decompressor = decompressobj(GZIP_WBITS if gzip else ZLIB_WBITS)
+        # Some servers send deflate without the zlib wrapper,
+        # which is only detectable at the start of the body
+        self.raw_fallback = not gzip
+        self.started = False
+
+    def decompress(self, data: bytes, size: int) -> Iterator[bytes]:
+        """
+        Yields the data decompressed in parts of up to `size` bytes.
+        """
+        try:
+            part = self.decompressor.decompress(data, size)
+        except ZlibError:
+            if self.started or not self.raw_fallback:
+                raise
+            self.decompressor = decompressobj(RAW_WBITS)
+            part = self.decompressor.decompress(data, size)
+        self.started = True
+        yield part
+        while self.decompressor.unconsumed_tail:
+            tail = self.decompressor.unconsumed_tail
+            yield self.decompressor.decompress(tail, size)
+
+    def flush(self) -> bytes:
+        """
+        Returns the rest of the decompressed data.
+        """
+        return self.decompressor.flush()
+
 class Response:
     """
-    Represents a server response.
+    Represents a server response. In streaming mode the body
+    is not read up front, but through `chunks()`. A gzip or
+    deflate encoded body is decompressed while it is read.
     """
-    def __init__(self, resp: http.HTTPResponse) -> None:
+    def __init__(self,
+        resp: http.HTTPResponse,
+        stream: bool=False,
+        request_time: float=None
+    ) -> None:
         self._resp = resp
+        # When the request was sent and the response received
+        self.response_time = time()
+        self.request_time = request_time or self.response_time
         self.version = resp.version
         self.code = resp.status
         self.reason = resp.reason
         self.status = f"{resp.status} {resp.reason}"
         self.closed = resp.closed
-        self.headers = self.parse_headers(str(resp.headers))
-        self.body = resp.read()
+        self.headers = Headers(resp.getheaders())
+        self.body: bytes = None
+        self.kept: bytearray = None
+        self.keep_limit: int = None
+        # Whether the body was too long to be kept
+        self.discarded = False
+        self.cached = False
+        # The size of the body as received and after decompressing
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        if not stream:
+            self.read()
+
+    @classmethod
+    def stored(cls,
+        version: int,
+        code: int,
+        reason: str,
+        headers: Headers,
+        body: bytes
+    ):
+        """
+        Creates a complete response which was not just
+        received over a connection, such as a cached one.
+        """
+        self = cls.__new__(cls)
+        self._resp = None
+        self.response_time = self.request_time = time()
+        self.version = version
+        self.code = code
+        self.reason = reason
+        self.status = f"{code} {reason}"
+        self.closed = True
+        self.headers = headers
+        self.body = body
+        self.kept = None
+        self.keep_limit = None
+        self.discarded = False
+        self.cached = True
+        self.wire_bytes = 0
+        self.decoded_bytes = len(body)
+        return self
 
     def __repr__(self) -> str:
         version = round(self.version / 10, 1)
@@ -44,21 +140,131 @@ class Response:
         """
         return self.headers["Location"]
 
+    def complete(self) -> bool:
+        """
+        Returns a boolean indicating whether
+        the whole body has been read.
+        """
+        return self.body is not None or self._resp.isclosed()
+
+    def keep(self, limit: int=None) -> None:
+        """
+        Makes the body be kept while it is streamed, so that it is
+        available as `body` once read. A body longer than `limit`
+        bytes is given up on, which is marked by `discarded`.
+        """
+        if self.body is None:
+            self.kept = bytearray()
+            self.keep_limit = limit
+
+    def content_decoder(self) -> ContentDecoder:
+        """
+        Returns a decoder for the body's content encoding,
+        or `None` if the body is not compressed.
+        """
+        encoding = self.headers.get("Content-Encoding", "").strip().lower()
+        if encoding in ("gzip", "x-gzip", "deflate"):
+            return ContentDecoder(encoding)
+        return None
+
+    def wire_chunks(self, size: int=CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Yields the rest of the body as received in chunks of up to
+        `size` bytes. The chunks are read into one reused buffer,
+        so each of them is only valid until the next one is requested.
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        while count := self._resp.readinto(buffer):
+            self.wire_bytes += count
+            yield view[:count]
+
+    def chunks(self, size: int=CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Yields the rest of the decompressed body in chunks of up
+        to `size` bytes, which are only valid until the next one
+        is requested.
+        """
+        if self.body is not None:
+            yield memoryview(self.body)
+            return
+        decoder = self.content_decoder()
+        for chunk in self.wire_chunks(size):
+            parts = decoder.decompress(chunk, size) if decoder else (chunk,)
+            for part in parts:
+                if part:
+                    yield self.received(part)
+        if decoder and (part := decoder.flush()):
+            yield self.received(part)
+        if self.kept is not None:
+            self.body = bytes(self.kept)
+            self.kept = None
+
+    def received(self, part: memoryview) -> memoryview:
+        """
+        Counts and, if kept, keeps a part of the decompressed body.
+        """
+        self.decoded_bytes += len(part)
+        if self.kept is not None:
+            if self.keep_limit is not None \
+            and len(self.kept) + len(part) > self.keep_limit:
+                self.kept = None
+                self.discarded = True
+            else:
+                self.kept += part
+        return memoryview(part)
+
+    def read(self) -> bytes:
+        """
+        Reads the rest of the body if streaming and returns the body.
+        """
+        if self.body is None:
+            # The chunks share a buffer, so each is copied
+            rest = b"".join(bytes(chunk) for chunk in self.chunks())
+            # A kept body is complete after the last chunk
+            if self.body is None:
+                self.body = rest
+        return self.body
+
+    def decoder(self) -> IncrementalDecoder:
+        """
+        Returns an incremental decoder for the body's charset,
+        falling back to the default charset if it is unknown.
+        """
+        try:
+            decoder = getincrementaldecoder(self.charset() or DEFAULT_CHARSET)
+        except LookupError:
+            decoder = getincrementaldecoder(DEFAULT_CHARSET)
+        return decoder("ignore")
+
+    def decoded_chunks(self, size: int=CHUNK_SIZE) -> Iterator[str]:
+        """
+        Decodes and yields the rest of the body chunk by chunk.
+        Bytes of a character split between two chunks are held
+        back until the character is complete.
+        """
+        decoder = self.decoder()
+        for chunk in self.chunks(size):
+            if text := decoder.decode(chunk):
+                yield text
+        if text := decoder.decode(b"", True):
+            yield text
+
     def decoded(self) -> str:
         """
         Decodes and returns the response body.
         """
-        return self.body.decode(self.charset() or \
+        return self.read().decode(self.charset() or \
         DEFAULT_CHARSET, "ignore")
 
     @staticmethod
-    def parse_headers(headers: str="") -> dict[str, str]:
+    def parse_headers(headers: str="") -> Headers:
         """
-        Parses the response headers into a dictionary.
+        Parses raw header lines into headers.
         """
-        header_dict = {}
+        fields = []
         for header in headers.split("\n"):
             match = headers_regex.match(header)
             if not match: continue
-            header_dict[match["name"]] = match["value"]
-        return header_dict
+            fields.append((match["name"], match["value"]))
+        return Headers(fields)
@@ -0,0 +1,33 @@
+import os
+from threading import get_ident
+
+def cache_home() -> str:
+    """
+    Returns the directory where the user's cached data is kept.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or \
+    os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "dash")
+
+def write_atomically(path: str, data: bytes) -> bool:
+    """
+    Writes the data to a temporary file which then replaces
+    the file at `path`, so that readers in other threads and
+    processes never see a partly written file. Returns a boolean
+    indicating whether the file was written; everything stored
+    by the requestor can be fetched or learned again, so callers
+    carry on without it.
+    """
+    temp = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, path)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        return False
+    return True
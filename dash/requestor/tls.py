@@ -0,0 +1,121 @@
+import http.client as http
+from ssl import SSLContext, SSLSession, create_default_context
+from threading import Lock
+
+# Hosts whose last TLS session is kept for resumption
+MAX_SESSIONS = 64
+
+_context: SSLContext = None
+_context_lock = Lock()
+
+def context() -> SSLContext:
+    """
+    Returns the TLS context shared by the whole process.
+    It is created on first use, since loading the system's
+    CA certificates is expensive.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            _context = create_default_context()
+        return _context
+
+class SessionCache:
+    """
+    Keeps the most recent TLS session per host, so that new
+    connections to the host can resume it with an abbreviated
+    handshake.
+    """
+    def __init__(self, max_sessions: int=MAX_SESSIONS) -> None:
+        self.max_sessions = max_sessions
+        # The most recently stored sessions are last
+        self.sessions: dict[tuple[str, int], SSLSession] = {}
+        self.lock = Lock()
+        self.resumed = 0
+        self.full = 0
+
+    def __repr__(self) -> str:
+        return f"<SessionCache resumed={self.resumed} full={self.full} \
+sessions={len(self.sessions)}>"
+
+    def get(self, host: str, port: int) -> SSLSession:
+        """
+        Returns the session stored for the host, or `None`.
+        """
+        with self.lock:
+            return self.sessions.get((host, port))
+
+    def store(self, host: str, port: int, session: SSLSession) -> None:
+        """
+        Stores the session for the host, evicting
+        the least recently stored one if necessary.
+        """
+        with self.lock:
+            self.sessions.pop((host, port), None)
+            self.sessions[(host, port)] = session
+            if len(self.sessions) > self.max_sessions:
+                del self.sessions[next(iter(self.sessions))]
+
+    def clear(self) -> None:
+        """
+        Forgets all sessions.
+        """
+        with self.lock:
+            self.sessions = {}
+
+shared_sessions = SessionCache()
+
+class HTTPSConnection(http.HTTPSConnection):
+    """
+    An HTTPS connection which resumes and stores TLS sessions
+    through a session cache.
+    """
+    def __init__(self, *args, sessions: SessionCache=shared_sessions,
+        **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.sessions = sessions
+
+    def connect(self) -> None:
+        http.HTTPConnection.connect(self)
+        host, port = self.server()
+        session = self.sessions.get(host, port) if self.sessions else None
+        self.sock = self._context.wrap_socket(self.sock,
+            server_hostname=host,
+            session=session
+        )
+        if self.sessions:
+            with self.sessions.lock:
+                if self.sock.session_reused:
+                    self.sessions.resumed += 1
+                else:
+                    self.sessions.full += 1
+
+    def getresponse(self) -> http.HTTPResponse:
+        resp = super().getresponse()
+        self.save_session()
+        return resp
+
+    def close(self) -> None:
+        self.save_session()
+        super().close()
+
+    def save_session(self) -> None:
+        """
+        Stores the connection's TLS session in the cache. With TLS 1.3
+        the session can only be resumed after the server's ticket has
+        been read along with a response, so it is stored afterwards.
+        """
+        if not self.sessions or self.sock is None:
+            return
+        session = getattr(self.sock, "session", None)
+        if session is not None:
+            self.sessions.store(*self.server(), session)
+
+    def server(self) -> tuple[str, int]:
+        """
+        Returns the host and port of the TLS server,
+        which is behind the proxy if tunneling.
+        """
+        if self._tunnel_host:
+            return (self._tunnel_host, self._tunnel_port)
+        return (self.host, self.port)
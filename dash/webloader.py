@@ -1,4 +1,9 @@
-from requestor import Url, HttpClient, HttpsClient
+from __future__ import annotations
+from queue import Queue
+from threading import Event, Thread
+from urllib.parse import urljoin
+from requestor import Url, Response, HttpClient, HttpsClient, \
+    shared_cache, shared_hsts
 from html_parser import Parser as HtmlParser
 from dom import Document
 
@@ -7,6 +12,12 @@ USER_AGENT = \
 AppleWebKit/537.36 (KHTML, like Gecko) \
 Chrome/92.0.4515.131 Safari/537.36 \
 Dash/0.1.0"
+MAX_REDIRECTS = 10
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+PERMANENT_REDIRECT_CODES = (301, 308)
+
+# Targets of permanent redirects by the URL they were received for
+permanent_redirects: dict[str, str] = {}
 
 class UnsupportedContentTypeError(Exception):
     """
@@ -28,34 +39,142 @@ class NotFoundError(Exception):
     def __init__(self) -> None:
         super().__init__(f"404 Not Found")
 
-def load(url: str) -> Document:
-    url: Url = Url.from_str(url)
+class TooManyRedirectsError(Exception):
+    """
+    Raised when a page redirects more times than allowed.
+    """
+
+class LoadCancelledError(Exception):
+    """
+    Raised when loading a page is cancelled.
+    """
+
+def check_cancelled(cancelled: Event) -> None:
+    """
+    Raises `LoadCancelledError` if the load has been cancelled.
+    """
+    if cancelled and cancelled.is_set():
+        raise LoadCancelledError
+
+def client_for(url: Url) -> HttpClient | HttpsClient:
+    """
+    Returns a client for the scheme of the `url`,
+    which is completed with the scheme's defaults.
+    """
+    url.validate()
     if url.scheme == "http":
         client = HttpClient()
-    elif url.scheme == "https" or not url.scheme:
+    else:
         client = HttpsClient()
     client.user_agent = USER_AGENT
-    conn = client.connect(url)
-    resp = conn.get(url.path)
+    client.complete(url)
+    return client
 
-    if resp.code == 200:
-        if resp.type() == "text/html":
-            html = resp.decoded()
-            parser = HtmlParser(html)
-            document = parser.parse()
-        else:
-            raise UnsupportedContentTypeError(
-                f"Content type '{resp.type()}' not supported"
-            )
+def parse(resp: Response, cancelled: Event=None) -> Document:
+    """
+    Parses the body of a successful response into a document,
+    stopping between two chunks if `cancelled` gets set.
+    """
+    if resp.type() != "text/html":
+        raise UnsupportedContentTypeError(
+            f"Content type '{resp.type()}' not supported"
+        )
+    # The parser starts on the first chunk of the body
+    # instead of waiting for all of it to arrive
+    parser = HtmlParser()
+    for html in resp.decoded_chunks():
+        check_cancelled(cancelled)
+        parser.feed(html)
+    return parser.close()
 
-    elif resp.code in (301, 302):
-        document = load(resp.location())
+def load(url: str, cancelled: Event=None) -> Document:
+    """
+    Loads the page at the `url`, following redirects. A connection
+    is reused for redirects within the same origin. If `cancelled`
+    gets set, the load stops at the next redirect or chunk of the
+    body with `LoadCancelledError`.
+    """
+    url: Url = Url.from_str(url)
+    conn = None
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            check_cancelled(cancelled)
+            # Known HTTPS-only hosts are not asked over HTTP
+            # just to redirect to HTTPS
+            shared_hsts.upgrade(url)
+            client = client_for(url)
+            target = permanent_redirects.get(str(url))
+            if target:
+                url = Url.from_str(target)
+                continue
+            if conn and conn.origin() != (url.scheme, url.domain, url.port):
+                conn.release()
+                conn = None
+            resp, conn = shared_cache.fetch(client, url, conn)
+            shared_hsts.observe(url, resp)
 
-    elif resp.code == 404:
-        raise NotFoundError
+            if resp.code in REDIRECT_CODES:
+                resp.read()
+                shared_cache.store(url, resp)
+                location = urljoin(str(url), resp.location())
+                if resp.code in PERMANENT_REDIRECT_CODES:
+                    permanent_redirects[str(url)] = location
+                target = Url.from_str(location)
+                shared_hsts.observe_redirect(url, target)
+                url = target
 
-    else:
-        raise HttpError(resp.code, resp.reason)
+            elif resp.code == 200:
+                document = parse(resp, cancelled)
+                shared_cache.store(url, resp)
+                return document
+
+            elif resp.code == 404:
+                raise NotFoundError
+
+            else:
+                raise HttpError(resp.code, resp.reason)
+
+        raise TooManyRedirectsError(f"More than {MAX_REDIRECTS} redirects")
+    except LoadCancelledError:
+        # The rest of the body is not worth reading to reuse the connection
+        if conn:
+            conn.close()
+            conn = None
+        raise
+    finally:
+        if conn:
+            conn.release()
+
+class PageLoad:
+    """
+    Loads a page on a worker thread. The outcome is put into
+    `results` as a `(document, error)` pair, which the thread
+    owning the GUI can poll without blocking.
+    """
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.results: Queue[tuple[Document, Exception]] = Queue()
+        self.cancelled = Event()
+        self.thread = Thread(target=self.run, daemon=True)
+
+    def start(self) -> None:
+        """
+        Starts loading the page.
+        """
+        self.thread.start()
+
+    def cancel(self) -> None:
+        """
+        Cancels the load. The worker stops at the next redirect
+        or chunk of the body and closes its connection; a blocking
+        network read cannot be interrupted before that.
+        """
+        self.cancelled.set()
 
-    conn.close()
-    return document
+    def run(self) -> None:
+        try:
+            document, error = load(self.url, self.cancelled), None
+        except Exception as e:
+            document, error = None, e
+        if not self.cancelled.is_set():
+            self.results.put((document, error))
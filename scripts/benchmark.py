@@ -0,0 +1,163 @@
+import os
+import ssl
+import subprocess
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import TemporaryDirectory
+from threading import Thread
+from timeit import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "dash"))
+
+from html_parser.tokenizer import Tokenizer
+from html_parser.tree_constructor import TreeConstructor
+from html_parser.tokens import StartTag, Character, Eof
+from requestor import HttpsClient, SessionCache
+from requestor.tls import HTTPSConnection, context
+
+PARAGRAPH = "<p class=\"text\">Lorem ipsum dolor sit amet, &amp; \
+consectetur adipiscing elit.</p>\n"
+REPEAT = 5
+
+def report(name: str, seconds: float, count: int, unit: str) -> None:
+    """
+    Prints the time per unit of a benchmark.
+    """
+    print(f"{name:<40} {seconds / count * 1e9:10.1f} ns/{unit}")
+
+def bench_dispatch() -> None:
+    """
+    Compares looking up a state method by its name
+    with looking it up in the dispatch table.
+    """
+    tokenizer = Tokenizer("")
+    tokenizer.reset()
+    count = 1_000_000
+    seconds = timeit(
+        lambda: getattr(tokenizer, tokenizer.state.lower() + "_state"),
+        number=count
+    )
+    report("dispatch: getattr by name", seconds, count, "lookup")
+    seconds = timeit(lambda: tokenizer.states[tokenizer.state], number=count)
+    report("dispatch: table", seconds, count, "lookup")
+
+def bench_tokenize() -> None:
+    """
+    Measures the tokenizer and tree constructor per input character.
+    """
+    html = "<html><body>" + PARAGRAPH * 2000 + "</body></html>"
+
+    def tokenize(coalesce: bool) -> None:
+        for _ in Tokenizer(html, coalesce).tokenize():
+            pass
+
+    def parse(coalesce: bool) -> None:
+        tree_constructor = TreeConstructor()
+        tree_constructor.reset()
+        for token in Tokenizer(html, coalesce).tokenize():
+            tree_constructor.handle(token)
+
+    for coalesce in (False, True):
+        mode = "runs" if coalesce else "chars"
+        seconds = timeit(lambda: tokenize(coalesce), number=REPEAT)
+        report(f"tokenize ({mode})", seconds, len(html) * REPEAT, "char")
+        seconds = timeit(lambda: parse(coalesce), number=REPEAT)
+        report(f"tokenize + tree ({mode})", seconds, len(html) * REPEAT, "char")
+
+def bench_text_node() -> None:
+    """
+    Measures inserting a single large text node in 1 KB runs,
+    which should cost the same per character at every size.
+    """
+    run = Character("x" * 1024)
+
+    def insert(count: int) -> None:
+        tree_constructor = TreeConstructor()
+        tree_constructor.reset()
+        tree_constructor.handle(StartTag("p"))
+        for _ in range(count):
+            tree_constructor.handle(run)
+        tree_constructor.handle(Eof())
+
+    for megabytes in (1, 2, 5):
+        count = megabytes * 1024
+        seconds = timeit(lambda: insert(count), number=1)
+        report(f"text node ({megabytes} MB)", seconds, count * 1024, "char")
+
+class PageHandler(BaseHTTPRequestHandler):
+    """
+    Serves a small page to every GET request.
+    """
+    def do_GET(self) -> None:
+        body = PARAGRAPH.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+def bench_tls() -> None:
+    """
+    Measures creating HTTPS clients and connecting to a local
+    TLS server with full and with resumed handshakes.
+    """
+    with TemporaryDirectory() as directory:
+        cert = os.path.join(directory, "cert.pem")
+        key = os.path.join(directory, "key.pem")
+        try:
+            subprocess.run([
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key, "-out", cert, "-days", "1",
+                "-subj", "/CN=localhost",
+                "-addext", "subjectAltName=DNS:localhost"
+            ], check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError):
+            print("tls: skipped, openssl is required to create a certificate")
+            return
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert, key)
+        server = ThreadingHTTPServer(("localhost", 0), PageHandler)
+        server.socket = server_context.wrap_socket(server.socket,
+            server_side=True
+        )
+        Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        context().load_verify_locations(cert)
+
+    count = 20
+    seconds = timeit(ssl.create_default_context, number=count)
+    report("https client: new context", seconds, count, "client")
+    seconds = timeit(HttpsClient, number=count)
+    report("https client: shared context", seconds, count, "client")
+
+    def get(sessions: SessionCache) -> None:
+        conn = HTTPSConnection("localhost", port,
+            context=context(),
+            sessions=sessions
+        )
+        conn.request("GET", "/")
+        conn.getresponse().read()
+        conn.close()
+
+    count = 200
+    for sessions in (None, SessionCache()):
+        mode = "resumed" if sessions else "full"
+        seconds = timeit(lambda: get(sessions), number=count)
+        report(f"https connect + GET ({mode})", seconds, count, "request")
+    print(f"tls: {sessions!r}")
+    server.shutdown()
+    server.server_close()
+
+BENCHMARKS = {
+    "dispatch": bench_dispatch,
+    "tokenize": bench_tokenize,
+    "text_node": bench_text_node,
+    "tls": bench_tls,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()